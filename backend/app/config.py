@@ -4,36 +4,58 @@ Supports: OpenAI, Anthropic, Google Gemini, DeepSeek, Mistral AI
 TTS: OpenAI, ElevenLabs, Google Cloud TTS
 """
 import os
-from typing import Dict, Any, Optional, Literal
+from enum import Enum
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 load_dotenv()
 
 # Provider types
-LLMProvider = Literal["openai", "anthropic", "gemini", "deepseek", "mistral"]
-TTSProvider = Literal["openai", "elevenlabs", "google_tts"]
+class _StrEnum(str, Enum):
+    """String enum whose str()/format() is the plain value, like the old Literals"""
+
+    def __str__(self) -> str:
+        return str.__str__(self)
+
+
+class LLMProvider(_StrEnum):
+    OPENAI = "openai"
+    ANTHROPIC = "anthropic"
+    GEMINI = "gemini"
+    DEEPSEEK = "deepseek"
+    MISTRAL = "mistral"
+
+
+class TTSProvider(_StrEnum):
+    OPENAI = "openai"
+    ELEVENLABS = "elevenlabs"
+    GOOGLE_TTS = "google_tts"
 
 # LLM Model definitions
-AVAILABLE_MODELS: Dict[LLMProvider, Dict[str, Dict[str, Any]]] = {
+AVAILABLE_MODELS: Mapping[LLMProvider, Dict[str, Dict[str, Any]]] = MappingProxyType({
     "openai": {
         "gpt-4o-mini": {
             "name": "GPT-4o Mini",
             "description": "Fast and efficient - Best for testing",
             "cost": "Low",
             "speed": "Fast",
+            "max_output_tokens": 16384,
         },
         "gpt-4o": {
             "name": "GPT-4o",
             "description": "High quality - Balanced performance",
             "cost": "Medium",
             "speed": "Medium",
+            "max_output_tokens": 16384,
         },
         "gpt-4-turbo": {
             "name": "GPT-4 Turbo",
             "description": "Powerful - High quality",
             "cost": "High",
             "speed": "Medium",
+            "max_output_tokens": 4096,
         },
     },
     "anthropic": {
@@ -42,18 +64,21 @@ AVAILABLE_MODELS: Dict[LLMProvider, Dict[str, Dict[str, Any]]] = {
             "description": "Fast and efficient - Best for testing",
             "cost": "Low",
             "speed": "Very Fast",
+            "max_output_tokens": 8192,
         },
         "claude-3-5-sonnet-20241022": {
             "name": "Claude 3.5 Sonnet",
             "description": "High quality - Best balance (Recommended)",
             "cost": "Medium",
             "speed": "Fast",
+            "max_output_tokens": 8192,
         },
         "claude-3-opus-20240229": {
             "name": "Claude 3 Opus",
             "description": "Most capable - Best quality",
             "cost": "High",
             "speed": "Medium",
+            "max_output_tokens": 4096,
         },
     },
     "gemini": {
@@ -62,24 +87,28 @@ AVAILABLE_MODELS: Dict[LLMProvider, Dict[str, Dict[str, Any]]] = {
             "description": "Newest - Fast and powerful (Recommended)",
             "cost": "Low",
             "speed": "Very Fast",
+            "max_output_tokens": 8192,
         },
         "gemini-exp-1206": {
             "name": "Gemini Experimental 1206",
             "description": "Experimental - Latest features",
             "cost": "Low",
             "speed": "Fast",
+            "max_output_tokens": 8192,
         },
         "gemini-1.5-flash": {
             "name": "Gemini 1.5 Flash",
             "description": "Fast and efficient - Stable",
             "cost": "Low",
             "speed": "Very Fast",
+            "max_output_tokens": 8192,
         },
         "gemini-1.5-pro": {
             "name": "Gemini 1.5 Pro",
             "description": "High quality - Best balance",
             "cost": "Medium",
             "speed": "Fast",
+            "max_output_tokens": 8192,
         },
     },
     "deepseek": {
@@ -88,6 +117,7 @@ AVAILABLE_MODELS: Dict[LLMProvider, Dict[str, Dict[str, Any]]] = {
             "description": "Very cheap - Surprisingly good quality",
             "cost": "Very Low",
             "speed": "Fast",
+            "max_output_tokens": 8192,
         },
     },
     "mistral": {
@@ -96,18 +126,20 @@ AVAILABLE_MODELS: Dict[LLMProvider, Dict[str, Dict[str, Any]]] = {
             "description": "Most capable - High quality",
             "cost": "Medium",
             "speed": "Fast",
+            "max_output_tokens": 4096,
         },
         "mistral-small-latest": {
             "name": "Mistral Small",
             "description": "Fast and efficient - Good balance",
             "cost": "Low",
             "speed": "Very Fast",
+            "max_output_tokens": 4096,
         },
     },
-}
+})
 
 # TTS Provider definitions
-AVAILABLE_TTS: Dict[TTSProvider, Dict[str, Any]] = {
+AVAILABLE_TTS: Mapping[TTSProvider, Dict[str, Any]] = MappingProxyType({
     "openai": {
         "name": "OpenAI TTS",
         "description": "High quality, natural voices",
@@ -186,11 +218,41 @@ AVAILABLE_TTS: Dict[TTSProvider, Dict[str, Any]] = {
             "en-US-Neural2-C": "US English - Male (Neural)",
         },
     },
-}
+})
+
+# Flat (provider, id) tables so update validation is a single set lookup
+_VALID_LLM_MODELS = frozenset(
+    (provider, model) for provider, models in AVAILABLE_MODELS.items() for model in models
+)
+_VALID_TTS_MODELS = frozenset(
+    (provider, model) for provider, info in AVAILABLE_TTS.items() for model in info["models"]
+)
+_VALID_TTS_VOICES = frozenset(
+    (provider, voice) for provider, info in AVAILABLE_TTS.items() for voice in info["voices"]
+)
+
+# Static parts of the /config listings; only has_api_key is filled in per call
+_LLM_MODELS_LISTING: Mapping[LLMProvider, Mapping[str, Any]] = MappingProxyType({
+    provider: MappingProxyType({"name": provider.title(), "models": models})
+    for provider, models in AVAILABLE_MODELS.items()
+})
+
+_TTS_LISTING: Mapping[TTSProvider, Mapping[str, Any]] = MappingProxyType({
+    provider: MappingProxyType({
+        "name": info["name"],
+        "description": info["description"],
+        "cost": info["cost"],
+        "models": info["models"],
+        "voices": info["voices"],
+    })
+    for provider, info in AVAILABLE_TTS.items()
+})
 
 
 class ModelConfig(BaseModel):
     """Configuration for a specific AI model"""
+    model_config = ConfigDict(defer_build=True, use_enum_values=True)
+
     provider: LLMProvider
     model: str
     api_key: str
@@ -198,6 +260,8 @@ class ModelConfig(BaseModel):
 
 class TTSConfig(BaseModel):
     """Configuration for TTS"""
+    model_config = ConfigDict(defer_build=True, use_enum_values=True)
+
     provider: TTSProvider
     model: str
     voice: str
@@ -207,20 +271,21 @@ class TTSConfig(BaseModel):
 class AppConfig:
     """
     Application-wide configuration for AI models and TTS
-    Singleton pattern - holds current runtime configuration
+    Holds current runtime configuration; use the module-level `config` instance
     """
-    _instance: Optional["AppConfig"] = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    __slots__ = (
+        "_current_llm_provider",
+        "_current_llm_model",
+        "_current_tts_provider",
+        "_current_tts_model",
+        "_current_tts_voice",
+        "_llm_api_keys",
+        "_tts_api_keys",
+        "_llm_config_cache",
+        "_tts_config_cache",
+    )
 
     def __init__(self):
-        if self._initialized:
-            return
-
         # Initialize LLM from environment variables (fallback)
         self._current_llm_provider: LLMProvider = "openai"
         self._current_llm_model: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
@@ -245,33 +310,39 @@ class AppConfig:
             "google_tts": os.getenv("GOOGLE_TTS_API_KEY"),
         }
 
-        self._initialized = True
+        # Memoized get_current_*_config results, cleared on every write
+        self._llm_config_cache: Optional[Mapping[str, Any]] = None
+        self._tts_config_cache: Optional[Mapping[str, Any]] = None
+
+    def _invalidate_config_cache(self) -> None:
+        # The TTS view depends on the OpenAI LLM key (shared fallback), so any
+        # write drops both cached views.
+        self._llm_config_cache = None
+        self._tts_config_cache = None
 
     # ========================================================================
     # LLM Configuration Methods
     # ========================================================================
 
-    def get_current_llm_config(self) -> Dict[str, Any]:
-        """Get current LLM configuration"""
-        return {
-            "provider": self._current_llm_provider,
-            "model": self._current_llm_model,
-            "model_info": AVAILABLE_MODELS.get(self._current_llm_provider, {}).get(
-                self._current_llm_model, {}
-            ),
-            "has_api_key": bool(self._llm_api_keys.get(self._current_llm_provider)),
-        }
+    def get_current_llm_config(self) -> Mapping[str, Any]:
+        """Get current LLM configuration (read-only, cached until next update)"""
+        if self._llm_config_cache is None:
+            self._llm_config_cache = MappingProxyType({
+                "provider": self._current_llm_provider,
+                "model": self._current_llm_model,
+                "model_info": AVAILABLE_MODELS.get(self._current_llm_provider, {}).get(
+                    self._current_llm_model, {}
+                ),
+                "has_api_key": bool(self._llm_api_keys.get(self._current_llm_provider)),
+            })
+        return self._llm_config_cache
 
     def get_available_llm_models(self) -> Dict[str, Any]:
         """Get all available LLM models grouped by provider"""
-        result = {}
-        for provider, models in AVAILABLE_MODELS.items():
-            result[provider] = {
-                "name": provider.title(),
-                "has_api_key": bool(self._llm_api_keys.get(provider)),
-                "models": models,
-            }
-        return result
+        return {
+            provider: {**listing, "has_api_key": bool(self._llm_api_keys.get(provider))}
+            for provider, listing in _LLM_MODELS_LISTING.items()
+        }
 
     def update_llm_config(
         self,
@@ -285,12 +356,13 @@ class AppConfig:
             raise ValueError(f"Invalid provider: {provider}")
 
         # Validate model
-        if model not in AVAILABLE_MODELS[provider]:
+        if (provider, model) not in _VALID_LLM_MODELS:
             raise ValueError(f"Invalid model for {provider}: {model}")
 
         # Update API key if provided
         if api_key:
             self._llm_api_keys[provider] = api_key
+            self._invalidate_config_cache()
 
         # Check if we have an API key for this provider
         if not self._llm_api_keys.get(provider):
@@ -299,6 +371,7 @@ class AppConfig:
         # Update current configuration
         self._current_llm_provider = provider
         self._current_llm_model = model
+        self._invalidate_config_cache()
 
         return True
 
@@ -313,38 +386,39 @@ class AppConfig:
         if provider not in AVAILABLE_MODELS:
             raise ValueError(f"Invalid provider: {provider}")
         self._llm_api_keys[provider] = api_key
+        self._invalidate_config_cache()
 
     # ========================================================================
     # TTS Configuration Methods
     # ========================================================================
 
-    def get_current_tts_config(self) -> Dict[str, Any]:
-        """Get current TTS configuration"""
-        tts_provider_info = AVAILABLE_TTS.get(self._current_tts_provider, {})
-        return {
-            "provider": self._current_tts_provider,
-            "model": self._current_tts_model,
-            "voice": self._current_tts_voice,
-            "provider_info": {
-                "name": tts_provider_info.get("name"),
-                "description": tts_provider_info.get("description"),
-            },
-            "has_api_key": bool(self._get_tts_api_key_with_fallback(self._current_tts_provider)),
-        }
+    def get_current_tts_config(self) -> Mapping[str, Any]:
+        """Get current TTS configuration (read-only, cached until next update)"""
+        if self._tts_config_cache is None:
+            tts_provider_info = AVAILABLE_TTS.get(self._current_tts_provider, {})
+            self._tts_config_cache = MappingProxyType({
+                "provider": self._current_tts_provider,
+                "model": self._current_tts_model,
+                "voice": self._current_tts_voice,
+                "provider_info": {
+                    "name": tts_provider_info.get("name"),
+                    "description": tts_provider_info.get("description"),
+                },
+                "has_api_key": bool(
+                    self._get_tts_api_key_with_fallback(self._current_tts_provider)
+                ),
+            })
+        return self._tts_config_cache
 
     def get_available_tts(self) -> Dict[str, Any]:
         """Get all available TTS providers"""
-        result = {}
-        for provider, info in AVAILABLE_TTS.items():
-            result[provider] = {
-                "name": info["name"],
-                "description": info["description"],
-                "cost": info["cost"],
-                "models": info["models"],
-                "voices": info["voices"],
+        return {
+            provider: {
+                **listing,
                 "has_api_key": bool(self._get_tts_api_key_with_fallback(provider)),
             }
-        return result
+            for provider, listing in _TTS_LISTING.items()
+        }
 
     def update_tts_config(
         self,
@@ -359,16 +433,17 @@ class AppConfig:
             raise ValueError(f"Invalid TTS provider: {provider}")
 
         # Validate model
-        if model not in AVAILABLE_TTS[provider]["models"]:
+        if (provider, model) not in _VALID_TTS_MODELS:
             raise ValueError(f"Invalid model for {provider}: {model}")
 
         # Validate voice
-        if voice not in AVAILABLE_TTS[provider]["voices"]:
+        if (provider, voice) not in _VALID_TTS_VOICES:
             raise ValueError(f"Invalid voice for {provider}: {voice}")
 
         # Update API key if provided
         if api_key:
             self._tts_api_keys[provider] = api_key
+            self._invalidate_config_cache()
 
         # Check if we have an API key (with fallback to LLM key for shared providers)
         if not self._get_tts_api_key_with_fallback(provider):
@@ -378,6 +453,7 @@ class AppConfig:
         self._current_tts_provider = provider
         self._current_tts_model = model
         self._current_tts_voice = voice
+        self._invalidate_config_cache()
 
         return True
 
@@ -407,6 +483,7 @@ class AppConfig:
         if provider not in AVAILABLE_TTS:
             raise ValueError(f"Invalid TTS provider: {provider}")
         self._tts_api_keys[provider] = api_key
+        self._invalidate_config_cache()
 
     # ========================================================================
     # Legacy Properties (for backward compatibility)
@@ -449,4 +526,4 @@ class AppConfig:
 
 
 # Singleton instance
-config = AppConfig()
\ No newline at end of file
+config = AppConfig()
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import json
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 
 
 class SlideContent(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     headline: str
     bullet_points: List[str] = Field(default_factory=list)
     visual_description: Optional[str] = None
@@ -16,6 +21,8 @@ class SlideContent(BaseModel):
 
 
 class SectionContent(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     section_id: str
     title: str
     explanation: str
@@ -24,17 +31,23 @@ class SectionContent(BaseModel):
 
 
 class LearningObjective(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     text: str
     bloom_level: Optional[str] = None
 
 
 class WorkedExample(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     title: str
     description: str
     code_snippet: Optional[str] = None
 
 
 class HandsOnProject(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     title: str
     description: str
     steps: List[str] = Field(default_factory=list)
@@ -42,6 +55,8 @@ class HandsOnProject(BaseModel):
 
 
 class QuizItem(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     question: str
     options: List[str]
     correct_option_index: int
@@ -49,6 +64,8 @@ class QuizItem(BaseModel):
 
 
 class LessonContent(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     lesson_id: str
     title: str
     estimated_minutes: Optional[int] = None
@@ -60,12 +77,69 @@ class LessonContent(BaseModel):
     quiz: List[QuizItem] = Field(default_factory=list)
 
 
+_LESSON_CACHE_SIZE = 128
+# path -> ((mtime_ns, size), parsed lesson); a changed stat means a re-parse.
+# Malformed files are cached as None so they are not re-parsed on every call.
+_LESSON_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Optional[LessonContent]]]" = OrderedDict()
+# Lessons are preloaded from worker threads at startup (see main.py)
+_LESSON_CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _lesson_adapter() -> TypeAdapter[LessonContent]:
+    # Built on first use so the deferred LessonContent schema is only compiled
+    # once a lesson file is actually loaded.
+    return TypeAdapter(LessonContent)
+
+
+def _read_small_file(path: Path) -> Tuple[Tuple[int, int], bytes]:
+    """Read a whole file with one sized read; returns ((mtime_ns, size), data)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        st = os.fstat(fd)
+        data = os.read(fd, st.st_size)
+        while len(data) < st.st_size:
+            chunk = os.read(fd, st.st_size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    return (st.st_mtime_ns, st.st_size), data
+
+
 def load_lesson_content(path: Path) -> Optional[LessonContent]:
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError:
         return None
+    key = str(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    with _LESSON_CACHE_LOCK:
+        cached = _LESSON_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            _LESSON_CACHE.move_to_end(key)
+            return cached[1]
+
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
-        return LessonContent.model_validate(raw)
-    except Exception:
+        signature, raw = _read_small_file(path)
+    except OSError:
         return None
+    content: Optional[LessonContent]
+    try:
+        content = _lesson_adapter().validate_json(raw)
+    except ValidationError:
+        content = None
+
+    with _LESSON_CACHE_LOCK:
+        _LESSON_CACHE[key] = (signature, content)
+        _LESSON_CACHE.move_to_end(key)
+        if len(_LESSON_CACHE) > _LESSON_CACHE_SIZE:
+            _LESSON_CACHE.popitem(last=False)
+    return content
+
+
+def lesson_content_paths(books_dir: Path) -> List[Path]:
+    """All lesson content files, in the same locations the video orchestrator reads."""
+    return [*books_dir.glob("*_content.json"), *books_dir.glob("*/*_content.json")]
 
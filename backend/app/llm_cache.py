@@ -0,0 +1,97 @@
+"""
+Persistent cache for LLM responses
+Stores completions in SQLite, keyed by a hash of the full request
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Kept next to (not inside) data/books so it is never served by /static/books
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "llm_cache.sqlite3"
+DEFAULT_TTL_SECONDS = 3600
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache with a per-entry TTL
+    Safe to share across threads; the connection is opened on first use
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Hash a canonicalized request (provider, model, messages, params)"""
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss or expired entry"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and time.time() - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                row = None
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, int(time.time())),
+            )
+            conn.commit()
+
+    def clear(self) -> int:
+        """Delete all entries; returns how many were removed"""
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute("DELETE FROM responses").rowcount
+            conn.commit()
+            return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connection().execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+            return {
+                **self.stats,
+                "entries": entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# Singleton instance
+llm_response_cache = LLMResponseCache()
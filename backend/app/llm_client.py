@@ -2,8 +2,138 @@
 Unified LLM client wrapper
 Abstracts API calls to OpenAI, Anthropic, Google Gemini, DeepSeek, and Mistral AI
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+import importlib.util
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from .config import config
+from .llm_cache import llm_response_cache
+
+
+# Anthropic only caches prompt prefixes of ~1024+ tokens; smaller blocks are
+# sent as plain strings. At most 4 cache breakpoints are allowed per request.
+_ANTHROPIC_CACHE_MIN_CHARS = 4000
+_ANTHROPIC_MAX_CACHE_BREAKPOINTS = 4
+
+
+DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+
+
+# ============================================================================
+# Provider SDK clients
+# Built once per API key (and per event loop for async clients) so their
+# HTTP connection pools and keep-alive connections are reused across calls.
+# SDKs are imported on first use, so unused providers are never loaded.
+# ============================================================================
+
+# One pooled HTTP client (per event loop for async) shared by every SDK, so
+# calls to the same host reuse connections; HTTP/2 multiplexes concurrent
+# requests over one connection when the h2 package is installed
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = dict(max_keepalive_connections=50, max_connections=100)
+_HTTP_TIMEOUT = dict(timeout=600.0, connect=5.0)  # long generations; fail fast on connect
+
+
+@lru_cache(maxsize=None)
+def _http_client() -> Any:
+    import httpx
+
+    return httpx.Client(
+        http2=_HTTP2,
+        limits=httpx.Limits(**_HTTP_LIMITS),
+        timeout=httpx.Timeout(**_HTTP_TIMEOUT),
+    )
+
+
+@lru_cache(maxsize=16)
+def _async_http_client(loop: asyncio.AbstractEventLoop) -> Any:
+    # Async HTTP pools are bound to the loop they were created on
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=_HTTP2,
+        limits=httpx.Limits(**_HTTP_LIMITS),
+        timeout=httpx.Timeout(**_HTTP_TIMEOUT),
+    )
+
+
+@lru_cache(maxsize=None)
+def _openai_client(api_key: str, base_url: Optional[str] = None) -> Any:
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=_http_client())
+
+
+@lru_cache(maxsize=16)
+def _async_openai_client(
+    api_key: str, base_url: Optional[str], loop: asyncio.AbstractEventLoop
+) -> Any:
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=api_key, base_url=base_url, http_client=_async_http_client(loop)
+    )
+
+
+@lru_cache(maxsize=None)
+def _anthropic_client(api_key: str) -> Any:
+    from anthropic import Anthropic
+
+    return Anthropic(api_key=api_key, http_client=_http_client())
+
+
+@lru_cache(maxsize=16)
+def _async_anthropic_client(api_key: str, loop: asyncio.AbstractEventLoop) -> Any:
+    from anthropic import AsyncAnthropic
+
+    return AsyncAnthropic(api_key=api_key, http_client=_async_http_client(loop))
+
+
+@lru_cache(maxsize=16)
+def _mistral_client(api_key: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> Any:
+    # Async calls pass their event loop and get a client with a loop-bound async pool
+    from mistralai import Mistral
+
+    return Mistral(
+        api_key=api_key,
+        client=_http_client(),
+        async_client=_async_http_client(loop) if loop is not None else None,
+    )
+
+
+_gemini_api_key: Optional[str] = None
+
+
+@lru_cache(maxsize=32)
+def _gemini_generative_model(
+    api_key: str, model_name: str, system_instruction: Optional[str]
+) -> Any:
+    # A model binds the configured client on first use, so handles are per key
+    import google.generativeai as genai
+
+    return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+
+def _gemini_model(
+    api_key: str, model_name: str, system_instruction: Optional[str] = None
+) -> Any:
+    """Gemini model handle; genai.configure() is global, so only re-run it on key changes"""
+    global _gemini_api_key
+    import google.generativeai as genai
+
+    if api_key != _gemini_api_key:
+        genai.configure(api_key=api_key)
+        _gemini_api_key = api_key
+    return _gemini_generative_model(api_key, model_name, system_instruction)
+
+
+class _InflightCall:
+    """An upstream LLM call shared by identical concurrent requests"""
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[str]"):
+        self.task = task
+        self.waiters = 0
 
 
 class LLMClient:
@@ -12,11 +142,17 @@ class LLMClient:
     Automatically uses the configured provider and model
     """
 
+    def __init__(self):
+        # Async requests currently awaiting the provider, by (event loop, request key)
+        self._inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], _InflightCall] = {}
+
     def chat_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        cache: bool = False,
+        json_mode: bool = False,
         **kwargs
     ) -> str:
         """
@@ -27,6 +163,10 @@ class LLMClient:
                      [{"role": "system", "content": "..."}, {"role": "user", "content": "..."}]
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
+            cache: Reuse a stored response for an identical request. Always on
+                   for temperature <= 0 (deterministic requests)
+            json_mode: Ask the provider for a JSON object response (native JSON
+                       mode; Anthropic has none, so its reply is prefilled with "{")
             **kwargs: Provider-specific parameters
 
         Returns:
@@ -39,7 +179,200 @@ class LLMClient:
         if not api_key:
             raise RuntimeError(f"No API key configured for {provider}")
 
-        # Route to appropriate provider
+        if json_mode:
+            kwargs = {**self._json_mode_params(provider), **kwargs}
+            messages = self._json_mode_messages(provider, messages)
+
+        cache_key = self._cache_key(
+            provider, model, messages, temperature, max_tokens, cache, kwargs
+        )
+        if cache_key is not None:
+            cached = llm_response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        response = self._complete(provider, messages, temperature, max_tokens, **kwargs)
+        if json_mode and provider == "anthropic":
+            response = "{" + response
+
+        # Don't pin empty (likely failed) generations in the cache
+        if cache_key is not None and response:
+            llm_response_cache.set(cache_key, response)
+
+        return response
+
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        cache: bool = False,
+        json_mode: bool = False,
+        **kwargs
+    ) -> str:
+        """
+        Async version of chat_completion using the providers' async SDK
+        clients, so many requests can be in flight from one event loop
+        """
+        provider = config.provider
+        model = config.model
+        api_key = config.api_key
+
+        if not api_key:
+            raise RuntimeError(f"No API key configured for {provider}")
+
+        if json_mode:
+            kwargs = {**self._json_mode_params(provider), **kwargs}
+            messages = self._json_mode_messages(provider, messages)
+
+        request_key = self._request_key(
+            provider, model, messages, temperature, max_tokens, kwargs
+        )
+        cache_key = request_key if self._cacheable(temperature, cache) else None
+
+        # Identical concurrent requests share one upstream call, run as its
+        # own task so cancelling one caller (even the first) leaves the
+        # others waiting on it; it is only cancelled once nobody waits
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, request_key)
+        call = self._inflight.get(inflight_key)
+        if call is None:
+            call = _InflightCall(loop.create_task(self._acomplete(
+                provider, messages, temperature, max_tokens, json_mode, cache_key, **kwargs
+            )))
+            self._inflight[inflight_key] = call
+
+            def forget(_: asyncio.Task) -> None:
+                if self._inflight.get(inflight_key) is call:
+                    del self._inflight[inflight_key]
+
+            call.task.add_done_callback(forget)
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    async def _acomplete(
+        self,
+        provider: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        json_mode: bool,
+        cache_key: Optional[str],
+        **kwargs
+    ) -> str:
+        """Response cache lookup, then route to the provider-specific async method"""
+        if cache_key is not None:
+            cached = llm_response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if provider == "openai":
+            response = await self._openai_acompletion(messages, temperature, max_tokens, **kwargs)
+        elif provider == "anthropic":
+            response = await self._anthropic_acompletion(messages, temperature, max_tokens, **kwargs)
+        elif provider == "gemini":
+            response = await self._gemini_acompletion(messages, temperature, max_tokens, **kwargs)
+        elif provider == "deepseek":
+            response = await self._deepseek_acompletion(messages, temperature, max_tokens, **kwargs)
+        elif provider == "mistral":
+            response = await self._mistral_acompletion(messages, temperature, max_tokens, **kwargs)
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+
+        if json_mode and provider == "anthropic":
+            response = "{" + response
+
+        if cache_key is not None and response:
+            llm_response_cache.set(cache_key, response)
+
+        return response
+
+    def request_fingerprint(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Stable hash of a request against the current provider and model.
+        Lets callers tell whether a saved generation is still up to date.
+        """
+        return self._request_key(
+            config.provider, config.model, messages, temperature, max_tokens, kwargs
+        )
+
+    @staticmethod
+    def _json_mode_params(provider: str) -> Dict[str, Any]:
+        """Provider parameters that request a JSON-only response"""
+        if provider in ("openai", "deepseek", "mistral"):
+            return {"response_format": {"type": "json_object"}}
+        if provider == "gemini":
+            return {"response_mime_type": "application/json"}
+        return {}
+
+    @staticmethod
+    def _json_mode_messages(
+        provider: str, messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Anthropic has no JSON mode: start the reply with "{" so it continues an object"""
+        if provider == "anthropic":
+            return [*messages, {"role": "assistant", "content": "{"}]
+        return messages
+
+    @staticmethod
+    def _cacheable(temperature: float, cache: bool) -> bool:
+        # Deterministic requests are always safe to reuse
+        return cache or temperature <= 0.0
+
+    @staticmethod
+    def _cache_key(
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        cache: bool,
+        kwargs: Dict[str, Any],
+    ) -> Optional[str]:
+        """Response cache key, or None when this request should not be cached"""
+        if not LLMClient._cacheable(temperature, cache):
+            return None
+        return LLMClient._request_key(provider, model, messages, temperature, max_tokens, kwargs)
+
+    @staticmethod
+    def _request_key(
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        return llm_response_cache.make_key({
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "kwargs": kwargs,
+        })
+
+    def _complete(
+        self,
+        provider: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """Route a request to the provider-specific completion method"""
         if provider == "openai":
             return self._openai_completion(messages, temperature, max_tokens, **kwargs)
         elif provider == "anthropic":
@@ -53,21 +386,56 @@ class LLMClient:
         else:
             raise ValueError(f"Unsupported provider: {provider}")
 
-    def _openai_completion(
+    def chat_completion_stream(
         self,
         messages: List[Dict[str, str]],
-        temperature: float,
-        max_tokens: Optional[int],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
         **kwargs
-    ) -> str:
-        """OpenAI API completion"""
-        from openai import OpenAI
+    ) -> Iterator[str]:
+        """
+        Streaming variant of chat_completion: yields text chunks as the
+        provider produces them, so callers can forward the first tokens
+        before the full generation finishes.
+
+        Streamed responses bypass the response cache.
+        """
+        provider = config.provider
+        api_key = config.api_key
 
-        client = OpenAI(api_key=config.api_key)
+        if not api_key:
+            raise RuntimeError(f"No API key configured for {provider}")
 
+        if provider == "openai":
+            yield from self._openai_stream(messages, temperature, max_tokens, **kwargs)
+        elif provider == "anthropic":
+            yield from self._anthropic_stream(messages, temperature, max_tokens, **kwargs)
+        elif provider == "gemini":
+            yield from self._gemini_stream(messages, temperature, max_tokens, **kwargs)
+        elif provider == "deepseek":
+            yield from self._deepseek_stream(messages, temperature, max_tokens, **kwargs)
+        elif provider == "mistral":
+            yield from self._mistral_stream(messages, temperature, max_tokens, **kwargs)
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+
+    # ========================================================================
+    # Request builders (shared by the blocking and streaming calls)
+    # ========================================================================
+
+    @staticmethod
+    def _chat_params(
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Parameters for OpenAI-style chat APIs (OpenAI, DeepSeek, Mistral)"""
         params: Dict[str, Any] = {
             "model": config.model,
-            "messages": messages,
+            "messages": [
+                {"role": msg["role"], "content": msg["content"]} for msg in messages
+            ],
             "temperature": temperature,
         }
 
@@ -76,33 +444,41 @@ class LLMClient:
 
         # Add any additional kwargs
         params.update(kwargs)
+        return params
 
-        response = client.chat.completions.create(**params)
-        return response.choices[0].message.content or ""
-
-    def _anthropic_completion(
-        self,
+    @staticmethod
+    def _anthropic_params(
         messages: List[Dict[str, str]],
         temperature: float,
         max_tokens: Optional[int],
         **kwargs
-    ) -> str:
-        """Anthropic Claude API completion"""
-        from anthropic import Anthropic
-
-        client = Anthropic(api_key=config.api_key)
-
+    ) -> Dict[str, Any]:
         # Anthropic requires separating system message from other messages
         system_message = None
         user_messages = []
+        breakpoints_left = _ANTHROPIC_MAX_CACHE_BREAKPOINTS
+
+        def cacheable(text: str) -> Any:
+            # Large blocks become prompt-cache breakpoints
+            nonlocal breakpoints_left
+            if len(text) < _ANTHROPIC_CACHE_MIN_CHARS or breakpoints_left == 0:
+                return text
+            breakpoints_left -= 1
+            return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
 
         for msg in messages:
             if msg["role"] == "system":
                 system_message = msg["content"]
-            else:
+
+        # System comes first in Anthropic's cache prefix order
+        if system_message:
+            system_message = cacheable(system_message)
+
+        for msg in messages:
+            if msg["role"] != "system":
                 user_messages.append({
                     "role": msg["role"],
-                    "content": msg["content"]
+                    "content": cacheable(msg["content"])
                 })
 
         params: Dict[str, Any] = {
@@ -117,66 +493,98 @@ class LLMClient:
 
         # Add any additional kwargs
         params.update(kwargs)
+        return params
 
-        response = client.messages.create(**params)
-
-        # Extract text from response
-        if response.content and len(response.content) > 0:
-            return response.content[0].text
-        return ""
-
-    def _gemini_completion(
-        self,
+    @staticmethod
+    def _gemini_request(
         messages: List[Dict[str, str]],
         temperature: float,
         max_tokens: Optional[int],
         **kwargs
-    ) -> str:
-        """Google Gemini API completion"""
-        import google.generativeai as genai
-
-        genai.configure(api_key=config.api_key)
-        model = genai.GenerativeModel(config.model)
-
-        # Convert messages to Gemini format
-        # Gemini uses a different conversation structure
+    ) -> Tuple[Any, List[Dict[str, Any]], Dict[str, Any]]:
+        """Returns (model, contents, generation_config) for a Gemini call"""
+        # Convert messages to Gemini's native chat format: the system prompt
+        # becomes the model's system_instruction, turns keep their roles
         system_instruction = None
-        conversation_parts = []
+        contents: List[Dict[str, Any]] = []
 
         for msg in messages:
             if msg["role"] == "system":
                 system_instruction = msg["content"]
             elif msg["role"] == "user":
-                conversation_parts.append({"role": "user", "parts": [msg["content"]]})
+                contents.append({"role": "user", "parts": [msg["content"]]})
             elif msg["role"] == "assistant":
-                conversation_parts.append({"role": "model", "parts": [msg["content"]]})
-
-        # Build the prompt
-        if len(conversation_parts) == 1 and conversation_parts[0]["role"] == "user":
-            # Simple single message
-            prompt = conversation_parts[0]["parts"][0]
-            if system_instruction:
-                prompt = f"{system_instruction}\n\n{prompt}"
-        else:
-            # Multi-turn conversation
-            prompt_parts = []
-            if system_instruction:
-                prompt_parts.append(system_instruction)
-            for part in conversation_parts:
-                role = "User" if part["role"] == "user" else "Assistant"
-                prompt_parts.append(f"{role}: {part['parts'][0]}")
-            prompt = "\n\n".join(prompt_parts)
+                contents.append({"role": "model", "parts": [msg["content"]]})
+
+        # Gemini needs at least one turn
+        if not contents and system_instruction:
+            contents.append({"role": "user", "parts": [system_instruction]})
+            system_instruction = None
+
+        model = _gemini_model(config.api_key, config.model, system_instruction)
 
         # Configure generation parameters
-        generation_config = {
+        generation_config: Dict[str, Any] = {
             "temperature": temperature,
         }
         if max_tokens is not None:
             generation_config["max_output_tokens"] = max_tokens
 
+        # Extra kwargs are generation settings (e.g. response_mime_type)
+        generation_config.update(kwargs)
+        return model, contents, generation_config
+
+    # ========================================================================
+    # Blocking completions
+    # ========================================================================
+
+    def _openai_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """OpenAI API completion"""
+        client = _openai_client(config.api_key)
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
+
+        response = client.chat.completions.create(**params)
+        return response.choices[0].message.content or ""
+
+    def _anthropic_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """Anthropic Claude API completion"""
+        client = _anthropic_client(config.api_key)
+        params = self._anthropic_params(messages, temperature, max_tokens, **kwargs)
+
+        response = client.messages.create(**params)
+
+        # Extract text from response
+        if response.content and len(response.content) > 0:
+            return response.content[0].text
+        return ""
+
+    def _gemini_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """Google Gemini API completion"""
+        model, contents, generation_config = self._gemini_request(
+            messages, temperature, max_tokens, **kwargs
+        )
+
         # Generate response
         response = model.generate_content(
-            prompt,
+            contents,
             generation_config=generation_config
         )
 
@@ -190,25 +598,9 @@ class LLMClient:
         **kwargs
     ) -> str:
         """DeepSeek API completion (OpenAI-compatible)"""
-        from openai import OpenAI
-
         # DeepSeek uses OpenAI-compatible API
-        client = OpenAI(
-            api_key=config.api_key,
-            base_url="https://api.deepseek.com"
-        )
-
-        params: Dict[str, Any] = {
-            "model": config.model,
-            "messages": messages,
-            "temperature": temperature,
-        }
-
-        if max_tokens is not None:
-            params["max_tokens"] = max_tokens
-
-        # Add any additional kwargs
-        params.update(kwargs)
+        client = _openai_client(config.api_key, DEEPSEEK_BASE_URL)
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
 
         response = client.chat.completions.create(**params)
         return response.choices[0].message.content or ""
@@ -221,36 +613,207 @@ class LLMClient:
         **kwargs
     ) -> str:
         """Mistral AI API completion"""
-        from mistralai import Mistral
+        client = _mistral_client(config.api_key)
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
 
-        client = Mistral(api_key=config.api_key)
+        response = client.chat.complete(**params)
 
-        # Convert messages to Mistral format
-        mistral_messages = []
-        for msg in messages:
-            mistral_messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+        if response.choices and len(response.choices) > 0:
+            return response.choices[0].message.content or ""
+        return ""
 
-        params: Dict[str, Any] = {
-            "model": config.model,
-            "messages": mistral_messages,
-            "temperature": temperature,
-        }
+    # ========================================================================
+    # Async completions
+    # ========================================================================
 
-        if max_tokens is not None:
-            params["max_tokens"] = max_tokens
+    async def _openai_acompletion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """OpenAI async completion"""
+        client = _async_openai_client(config.api_key, None, asyncio.get_running_loop())
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
 
-        # Add any additional kwargs
-        params.update(kwargs)
+        response = await client.chat.completions.create(**params)
+        return response.choices[0].message.content or ""
 
-        response = client.chat.complete(**params)
+    async def _anthropic_acompletion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """Anthropic Claude async completion"""
+        client = _async_anthropic_client(config.api_key, asyncio.get_running_loop())
+        params = self._anthropic_params(messages, temperature, max_tokens, **kwargs)
+
+        response = await client.messages.create(**params)
+
+        if response.content and len(response.content) > 0:
+            return response.content[0].text
+        return ""
+
+    async def _gemini_acompletion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """Google Gemini async completion"""
+        model, contents, generation_config = self._gemini_request(
+            messages, temperature, max_tokens, **kwargs
+        )
+
+        response = await model.generate_content_async(
+            contents,
+            generation_config=generation_config
+        )
+
+        return response.text
+
+    async def _deepseek_acompletion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """DeepSeek async completion (OpenAI-compatible)"""
+        client = _async_openai_client(
+            config.api_key, DEEPSEEK_BASE_URL, asyncio.get_running_loop()
+        )
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
+
+        response = await client.chat.completions.create(**params)
+        return response.choices[0].message.content or ""
+
+    async def _mistral_acompletion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> str:
+        """Mistral AI async completion"""
+        client = _mistral_client(config.api_key, asyncio.get_running_loop())
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
+
+        response = await client.chat.complete_async(**params)
 
         if response.choices and len(response.choices) > 0:
             return response.choices[0].message.content or ""
         return ""
 
+    # ========================================================================
+    # Streaming completions
+    # ========================================================================
+
+    def _openai_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Iterator[str]:
+        """OpenAI streamed completion"""
+        client = _openai_client(config.api_key)
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
+
+        for chunk in client.chat.completions.create(stream=True, **params):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _anthropic_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Iterator[str]:
+        """Anthropic Claude streamed completion"""
+        client = _anthropic_client(config.api_key)
+        params = self._anthropic_params(messages, temperature, max_tokens, **kwargs)
+
+        with client.messages.stream(**params) as stream:
+            yield from stream.text_stream
+
+    def _gemini_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Iterator[str]:
+        """Google Gemini streamed completion"""
+        model, contents, generation_config = self._gemini_request(
+            messages, temperature, max_tokens, **kwargs
+        )
+
+        for chunk in model.generate_content(
+            contents,
+            generation_config=generation_config,
+            stream=True,
+        ):
+            if chunk.text:
+                yield chunk.text
+
+    def _deepseek_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Iterator[str]:
+        """DeepSeek streamed completion (OpenAI-compatible)"""
+        client = _openai_client(config.api_key, DEEPSEEK_BASE_URL)
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
+
+        for chunk in client.chat.completions.create(stream=True, **params):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _mistral_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Iterator[str]:
+        """Mistral AI streamed completion"""
+        client = _mistral_client(config.api_key)
+        params = self._chat_params(messages, temperature, max_tokens, **kwargs)
+
+        for event in client.chat.stream(**params):
+            choices = event.data.choices
+            if choices and choices[0].delta.content:
+                yield choices[0].delta.content
+
+    def warm_up(self) -> None:
+        """
+        Import the current provider's SDK and build its client ahead of the
+        first request. Other providers' SDKs stay unloaded.
+        """
+        provider = config.provider
+        api_key = config.api_key
+        if not api_key:
+            return
+
+        if provider == "openai":
+            _openai_client(api_key)
+        elif provider == "anthropic":
+            _anthropic_client(api_key)
+        elif provider == "gemini":
+            _gemini_model(api_key, config.model)
+        elif provider == "deepseek":
+            _openai_client(api_key, DEEPSEEK_BASE_URL)
+        elif provider == "mistral":
+            _mistral_client(api_key)
+
     def test_connection(self) -> Dict[str, Any]:
         """
         Test the current configuration by making a simple API call
@@ -1,8 +1,19 @@
-import json
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
+import orjson
+
+from .config import config
 from .llm_client import llm_client
 
+# Rough chars-per-token ratio for English, used when tiktoken is unavailable
+_CHARS_PER_TOKEN = 4
+
+# Token budget for the book excerpt sent with the outline prompt
+OUTLINE_BOOK_TOKENS = 6000
+
+OUTLINE_TEMPERATURE = 0.4
+
 
 OUTLINE_SYSTEM_PROMPT = """
 You are an expert course designer for technical topics.
@@ -36,38 +47,146 @@ Just pure JSON.
 """
 
 
-def generate_course_outline(book_text: str, book_title: str | None = None) -> Dict[str, Any]:
+@lru_cache(maxsize=8)
+def _encoding_for_model(model: str):
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Non-OpenAI models: cl100k_base is a close enough approximation
+        return tiktoken.get_encoding("cl100k_base")
+
+
+# Static, book-derived text first and the short title last, so repeat calls
+# for the same book share a long prompt prefix (provider prompt caching)
+_OUTLINE_USER_TEMPLATE = "Here is the book content.\nBook text (truncated):\n{text}{title_line}"
+
+
+def warm_up_tokenizer() -> None:
+    """Load the current model's tokenizer (BPE ranks) before the first outline request"""
+    try:
+        _encoding_for_model(config.model)
+    except ImportError:
+        pass
+
+
+@lru_cache(maxsize=32)
+def truncate_for_model(text: str, model: str, max_tokens: int) -> str:
     """
-    Call the LLM to generate a course outline JSON.
-    We truncate book_text to avoid token overflow in v1.
+    Truncate text to at most max_tokens tokens for the given model.
+    Cuts on token boundaries, so it never splits a multi-byte character.
+    Memoized: repeat calls for the same book skip re-encoding.
     """
+    try:
+        encoding = _encoding_for_model(model)
+    except ImportError:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+
+    # Anything this short cannot exceed the budget; skip the encode
+    if len(text) <= max_tokens:
+        return text
+
+    # A token rarely spans more than 2x the average, so only encode that prefix
+    head = text[: max_tokens * _CHARS_PER_TOKEN * 2]
+    tokens = encoding.encode(head, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return head
+    return encoding.decode(tokens[:max_tokens])
+
+
+def _outline_messages(book_text: str, book_title: str | None) -> List[Dict[str, str]]:
     # truncate large books for v1 (you can replace with RAG later)
-    max_chars = 20000
-    truncated_text = book_text[:max_chars]
+    truncated_text = truncate_for_model(
+        book_text, config.model, OUTLINE_BOOK_TOKENS
+    )
+
+    user_prompt = _OUTLINE_USER_TEMPLATE.format(
+        text=truncated_text,
+        title_line=f"\n\nBook title: {book_title}" if book_title else "",
+    )
 
-    user_prompt = "Here is the book content.\n"
-    if book_title:
-        user_prompt += f"Book title: {book_title}\n\n"
-    user_prompt += f"Book text (truncated):\n{truncated_text}"
+    return [
+        {"role": "system", "content": OUTLINE_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
 
-    content = llm_client.chat_completion(
-        messages=[
-            {"role": "system", "content": OUTLINE_SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=0.4,
+
+def course_outline_fingerprint(book_text: str, book_title: str | None = None) -> str:
+    """Fingerprint of the outline request for this book under the current model"""
+    return llm_client.request_fingerprint(
+        _outline_messages(book_text, book_title),
+        temperature=OUTLINE_TEMPERATURE,
+        json_mode=True,
     )
 
+
+def extract_json_object(content: str) -> Optional[str]:
+    """
+    Return the first balanced top-level {...} in content, or None.
+    Single pass; braces inside JSON strings are ignored.
+    """
+    start = content.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(content)):
+        ch = content[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return content[start : i + 1]
+    return None
+
+
+def _parse_outline(content: str) -> Dict[str, Any]:
+    """Parse the outline JSON out of the model's reply"""
     try:
-        outline = json.loads(content)
-    except json.JSONDecodeError as e:
-        # Simple recovery: try to extract JSON between first { and last }
-        start = content.find("{")
-        end = content.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            json_str = content[start : end + 1]
-            outline = json.loads(json_str)
-        else:
+        outline = orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        # Recovery for replies wrapped in prose or markdown fences
+        json_str = extract_json_object(content)
+        if json_str is None:
             raise RuntimeError(f"Failed to parse JSON from model: {e}\nRaw content:\n{content}")
+        outline = orjson.loads(json_str)
 
     return outline
+
+
+def generate_course_outline(book_text: str, book_title: str | None = None) -> Dict[str, Any]:
+    """
+    Call the LLM to generate a course outline JSON.
+    We truncate book_text to a token budget to avoid overflow in v1.
+    """
+    content = llm_client.chat_completion(
+        messages=_outline_messages(book_text, book_title),
+        temperature=OUTLINE_TEMPERATURE,
+        json_mode=True,
+    )
+
+    return _parse_outline(content)
+
+
+async def agenerate_course_outline(book_text: str, book_title: str | None = None) -> Dict[str, Any]:
+    """Async version of generate_course_outline"""
+    content = await llm_client.achat_completion(
+        messages=_outline_messages(book_text, book_title),
+        temperature=OUTLINE_TEMPERATURE,
+        json_mode=True,
+    )
+    return _parse_outline(content)
+
@@ -1,45 +1,115 @@
+import asyncio
+import shutil
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
+import orjson
 from fastapi import FastAPI, UploadFile, File, HTTPException, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from pypdf import PdfReader
+from pydantic import BaseModel, ConfigDict
 
 from .pdf_utils import (
     save_uploaded_pdf,
-    extract_text_from_pdf,
+    extract_page_texts,
+    join_page_texts,
     extract_images_from_pdf,
     save_book_text,
     load_book_text,
     load_book_images,
+    save_book_meta,
+    load_book_meta,
+    guess_book_title,
     BOOKS_DIR,
+    BOOK_TEXT_MAX_CHARS,
 )
-from .llm_utils import generate_course_outline
+from .llm_utils import (
+    agenerate_course_outline,
+    course_outline_fingerprint,
+    truncate_for_model,
+    warm_up_tokenizer,
+)
+from .lesson_content import load_lesson_content, lesson_content_paths
 from .script_generator import (
-    generate_lesson_script,
+    agenerate_lesson_script,
+    agenerate_lesson_scripts,
+    agenerate_lesson_scripts_batch,
+    stream_lesson_script,
     extract_code_examples,
-    generate_quiz_questions,
-)
-from .video_utils import (
-    list_available_avatars,
-    list_available_voices,
-    HeyGenError,
-)
-from .video_enhancer import (
-    enhance_video_from_url,
-    check_ffmpeg_installed,
-    VideoEnhancerError,
+    agenerate_quiz_questions,
+    lesson_script_fingerprint,
+    lesson_script_batch_fingerprint,
+    quiz_fingerprint,
+    LESSON_LLM_CONCURRENCY,
 )
 from .video_orchestrator import generate_lesson_video
 from .config import config, AVAILABLE_MODELS, AVAILABLE_TTS, LLMProvider, TTSProvider
 from .llm_client import llm_client
+from .llm_cache import llm_response_cache
 from .tts_client import tts_client
 
+# Worker threads for blocking SDK calls and file I/O run via asyncio.to_thread.
+# These threads mostly wait on the network, so use more than the CPU-based default.
+BLOCKING_IO_THREADS = 64
+
+# Token budget for the book context sent with script requests
+SCRIPT_CONTEXT_TOKENS = 1250
+
+# Outlines shared across books, keyed by the outline request fingerprint, so
+# books with identical text (re-exported or renamed PDFs) are outlined once
+OUTLINE_CACHE_DIR = BOOKS_DIR / "_outline_cache"
+
+
+async def _preload_lesson_content() -> None:
+    """Parse existing lesson content files into the in-memory lesson cache."""
+    paths = lesson_content_paths(BOOKS_DIR)
+    await asyncio.gather(*(asyncio.to_thread(load_lesson_content, p) for p in paths))
+
+
+async def _warm_up_llm() -> None:
+    """Load the tokenizer and the current provider's SDK ahead of the first LLM request"""
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(warm_up_tokenizer),
+            asyncio.to_thread(llm_client.warm_up),
+        )
+    except Exception as e:
+        # Best effort: the first request will retry and surface the real error
+        print(f"⚠️ LLM warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Startup: size the default executor used by asyncio.to_thread, preload
+    lesson content, and start the LLM and TTS warm-ups in the background so
+    they don't delay startup. Shutdown: cancel warm-ups still running.
+    """
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_THREADS)
+    )
+    await _preload_lesson_content()
+
+    warm_ups = [
+        asyncio.create_task(_warm_up_llm()),
+        asyncio.create_task(asyncio.to_thread(tts_client.warm_up)),
+    ]
+    try:
+        yield
+    finally:
+        for task in warm_ups:
+            task.cancel()
+        await asyncio.gather(*warm_ups, return_exceptions=True)
+
+
 app = FastAPI(
     title="Book-to-Video Course Generator",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Allow everything for now (for local dev)
@@ -71,12 +141,16 @@ class EnhanceRequest(BaseModel):
 
 
 class UpdateConfigRequest(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     provider: LLMProvider
     model: str
     api_key: Optional[str] = None
 
 
 class UpdateTTSConfigRequest(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     provider: TTSProvider
     model: str
     voice: str
@@ -93,23 +167,45 @@ async def upload_book(file: UploadFile = File(...)) -> Dict[str, Any]:
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported for now")
 
+    # PDF parsing and vision calls are blocking; keep them off the event loop
+
     # 1) Save PDF
-    book_id, pdf_path = save_uploaded_pdf(file)
+    book_id, pdf_path = await asyncio.to_thread(save_uploaded_pdf, file)
 
-    # 2) Extract text from the full book
-    text = extract_text_from_pdf(pdf_path, max_pages=None)
+    # Same PDF as an earlier upload (book_id is a content hash): reuse its
+    # extracted text and images
+    meta = await asyncio.to_thread(load_book_meta, book_id)
+    if meta is not None and meta.get("page_count") is not None:
+        images = await asyncio.to_thread(load_book_images, book_id)
+        return {
+            "book_id": book_id,
+            "pages_processed": meta["page_count"],
+            "images_extracted": len(images),
+            "message": "Book already uploaded, reusing extracted text and images.",
+        }
+
+    # 2) Extract text (prompts only use a leading excerpt of the book)
+    page_texts, page_count = await asyncio.to_thread(
+        extract_page_texts, pdf_path, max_pages=None, max_chars=BOOK_TEXT_MAX_CHARS
+    )
+    text = join_page_texts(page_texts, BOOK_TEXT_MAX_CHARS)
     if not text.strip():
         raise HTTPException(status_code=400, detail="Could not extract text from PDF")
 
     # 3) Save raw text
-    save_book_text(book_id, text)
+    await asyncio.to_thread(save_book_text, book_id, text)
 
     # 4) Extract images from PDF
-    images = extract_images_from_pdf(pdf_path, book_id)
+    images = await asyncio.to_thread(
+        extract_images_from_pdf, pdf_path, book_id, page_texts=page_texts
+    )
+
+    # 5) Save metadata last: its presence marks the upload as fully processed
+    await asyncio.to_thread(save_book_meta, book_id, text, page_count)
 
     return {
         "book_id": book_id,
-        "pages_processed": len(PdfReader(str(pdf_path)).pages),
+        "pages_processed": page_count,
         "images_extracted": len(images),
         "message": "Book uploaded, text and images extracted.",
     }
@@ -118,7 +214,7 @@ async def upload_book(file: UploadFile = File(...)) -> Dict[str, Any]:
 @app.get("/books/{book_id}/images")
 async def get_book_images(book_id: str) -> Dict[str, Any]:
     """Get list of images extracted from a book."""
-    images = load_book_images(book_id)
+    images = await asyncio.to_thread(load_book_images, book_id)
     return {
         "book_id": book_id,
         "images": images,
@@ -126,30 +222,78 @@ async def get_book_images(book_id: str) -> Dict[str, Any]:
     }
 
 
+def _fingerprint_path(artifact_path: Path) -> Path:
+    return artifact_path.with_name(artifact_path.name + ".fingerprint")
+
+
+def _is_up_to_date(artifact_path: Path, fingerprint: str) -> bool:
+    """True if artifact_path was generated from a request with this fingerprint"""
+    try:
+        return (
+            artifact_path.exists()
+            and _fingerprint_path(artifact_path).read_text(encoding="utf-8") == fingerprint
+        )
+    except OSError:
+        return False
+
+
+def _write_fingerprint(artifact_path: Path, fingerprint: str) -> None:
+    _fingerprint_path(artifact_path).write_text(fingerprint, encoding="utf-8")
+
+
+def _save_shared_outline(shared_path: Path, data: bytes) -> None:
+    shared_path.parent.mkdir(parents=True, exist_ok=True)
+    shared_path.write_bytes(data)
+
+
 @app.post("/books/{book_id}/outline")
-async def create_outline(book_id: str) -> Dict[str, Any]:
+async def create_outline(book_id: str, regenerate: bool = False) -> Dict[str, Any]:
+    """
+    Generate a course outline for a book. A saved outline is reused when the
+    book text, prompt and model are unchanged, unless `regenerate` is set.
+    """
     # 1) load text
     try:
-        text = load_book_text(book_id)
+        text = await asyncio.to_thread(load_book_text, book_id, head_only=True)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Book text not found. Upload first.")
 
-    # crude guess for title: first line of text
-    first_line = text.splitlines()[0].strip() if text.strip() else None
-    book_title = first_line if first_line else None
+    # crude guess for title, stored at upload time (older books: from the text)
+    meta = await asyncio.to_thread(load_book_meta, book_id)
+    book_title = meta.get("title_guess") if meta is not None else guess_book_title(text)
+
+    outline_path = BOOKS_DIR / f"{book_id}_outline.json"
+    fingerprint = course_outline_fingerprint(text, book_title=book_title)
+    if not regenerate and await asyncio.to_thread(_is_up_to_date, outline_path, fingerprint):
+        outline = await asyncio.to_thread(_read_outline, outline_path)
+        return {
+            "book_id": book_id,
+            "outline": outline,
+            "cached": True,
+        }
+
+    shared_path = OUTLINE_CACHE_DIR / f"{fingerprint}.json"
+    if not regenerate and await asyncio.to_thread(shared_path.exists):
+        await asyncio.to_thread(shutil.copyfile, shared_path, outline_path)
+        await asyncio.to_thread(_write_fingerprint, outline_path, fingerprint)
+        outline = await asyncio.to_thread(_read_outline, outline_path)
+        return {
+            "book_id": book_id,
+            "outline": outline,
+            "cached": True,
+        }
 
     # 2) generate outline
     try:
-        outline = generate_course_outline(text, book_title=book_title)
+        outline = await agenerate_course_outline(text, book_title=book_title)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate outline: {e}")
 
-    # 3) persist outline JSON
-    outline_path = BOOKS_DIR / f"{book_id}_outline.json"
-    outline_path.write_text(
-        json_dumps(outline),
-        encoding="utf-8",
-    )
+    # 3) persist outline JSON, for this book and for any book with the same text
+    data = json_bytes(outline)
+    await asyncio.to_thread(outline_path.write_bytes, data)
+    await asyncio.to_thread(_write_fingerprint, outline_path, fingerprint)
+    await asyncio.to_thread(_save_shared_outline, shared_path, data)
 
     return {
         "book_id": book_id,
@@ -157,50 +301,116 @@ async def create_outline(book_id: str) -> Dict[str, Any]:
     }
 
 
-def json_dumps(obj: Any) -> str:
-    import json
+def json_bytes(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON, ready for Path.write_bytes"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
 
-    return json.dumps(obj, ensure_ascii=False, indent=2)
 
+@lru_cache(maxsize=64)
+def _parse_outline_file(
+    path_str: str, mtime_ns: int
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    # mtime_ns is part of the cache key: rewriting the outline invalidates it
+    outline = orjson.loads(Path(path_str).read_bytes())
+    # Reversed so that, as with a linear scan, the first lesson wins on duplicate ids
+    lessons_by_id = {les["id"]: les for les in reversed(outline.get("lessons", []))}
+    return outline, lessons_by_id
 
-@app.post("/books/{book_id}/lessons/{lesson_id}/script")
-async def generate_script(book_id: str, lesson_id: str) -> Dict[str, Any]:
-    """Generate a video script for a specific lesson"""
-    # Load outline
+
+def _read_outline_indexed(
+    outline_path: Path,
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Parsed outline and its lessons keyed by id, cached until the file
+    changes. Both are shared between requests and must not be mutated.
+    """
+    return _parse_outline_file(str(outline_path), outline_path.stat().st_mtime_ns)
+
+
+def _read_outline(outline_path: Path) -> Dict[str, Any]:
+    return _read_outline_indexed(outline_path)[0]
+
+
+async def _load_outline_and_lesson(book_id: str, lesson_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Load a book's outline and the lesson with `lesson_id`, or raise 404."""
     outline_path = BOOKS_DIR / f"{book_id}_outline.json"
     if not outline_path.exists():
         raise HTTPException(status_code=404, detail="Outline not found. Generate outline first.")
 
-    import json
-    outline = json.loads(outline_path.read_text(encoding="utf-8"))
-
-    # Find the lesson
-    lesson = None
-    for les in outline.get("lessons", []):
-        if les["id"] == lesson_id:
-            lesson = les
-            break
+    outline, lessons_by_id = await asyncio.to_thread(_read_outline_indexed, outline_path)
 
+    lesson = lessons_by_id.get(lesson_id)
     if not lesson:
         raise HTTPException(status_code=404, detail=f"Lesson {lesson_id} not found")
 
+    return outline, lesson
+
+
+def _script_book_context(book_text: str) -> str:
+    """Leading book excerpt passed to the script generator as context"""
+    return truncate_for_model(
+        book_text, config.model, SCRIPT_CONTEXT_TOKENS
+    )
+
+
+def _script_is_up_to_date(
+    script_path: Path, lesson: Dict[str, Any], book_context: str, course_title: str
+) -> bool:
+    """True if the saved script came from an unchanged /script or /scripts/batch request"""
+    try:
+        if not script_path.exists():
+            return False
+        saved = _fingerprint_path(script_path).read_text(encoding="utf-8")
+    except OSError:
+        return False
+    return saved in (
+        lesson_script_fingerprint(lesson, book_context, course_title),
+        lesson_script_batch_fingerprint(lesson, book_context, course_title),
+    )
+
+
+@app.post("/books/{book_id}/lessons/{lesson_id}/script")
+async def generate_script(book_id: str, lesson_id: str, regenerate: bool = False) -> Dict[str, Any]:
+    """
+    Generate a video script for a specific lesson. A saved script is reused
+    when its request is unchanged, unless `regenerate` is set.
+    """
+    outline, lesson = await _load_outline_and_lesson(book_id, lesson_id)
+
     # Load book text for context
     try:
-        book_text = load_book_text(book_id)
+        book_text = await asyncio.to_thread(load_book_text, book_id, head_only=True)
     except FileNotFoundError:
         book_text = ""
 
+    book_context = _script_book_context(book_text)
+    course_title = outline.get("course_title", "")
+    script_path = BOOKS_DIR / f"{book_id}_{lesson_id}_script.txt"
+    fingerprint = lesson_script_fingerprint(lesson, book_context, course_title)
+    if not regenerate and await asyncio.to_thread(
+        _script_is_up_to_date, script_path, lesson, book_context, course_title
+    ):
+        script = await asyncio.to_thread(script_path.read_text, encoding="utf-8")
+        return {
+            "book_id": book_id,
+            "lesson_id": lesson_id,
+            "script": script,
+            "script_length": len(script),
+            "cached": True,
+        }
+
     # Generate script
     try:
-        script = generate_lesson_script(
+        script = await agenerate_lesson_script(
             lesson=lesson,
-            book_context=book_text[:5000],  # First 5000 chars for context
-            course_title=outline.get("course_title", "")
+            book_context=book_context,
+            course_title=course_title,
+            cache=not regenerate,
         )
 
         # Save script
-        script_path = BOOKS_DIR / f"{book_id}_{lesson_id}_script.txt"
-        script_path.write_text(script, encoding="utf-8")
+        await asyncio.to_thread(script_path.write_text, script, encoding="utf-8")
+        await asyncio.to_thread(_write_fingerprint, script_path, fingerprint)
 
         return {
             "book_id": book_id,
@@ -212,34 +422,135 @@ async def generate_script(book_id: str, lesson_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to generate script: {e}")
 
 
-@app.post("/books/{book_id}/lessons/{lesson_id}/quiz")
-async def generate_quiz(book_id: str, lesson_id: str) -> Dict[str, Any]:
-    """Generate quiz questions for a specific lesson"""
-    # Load outline
+@app.post("/books/{book_id}/lessons/{lesson_id}/script/stream")
+async def stream_script(book_id: str, lesson_id: str) -> StreamingResponse:
+    """
+    Generate a lesson script and stream it back as plain text while the model
+    writes it. The full script is saved once the stream completes.
+    """
+    outline, lesson = await _load_outline_and_lesson(book_id, lesson_id)
+
+    try:
+        book_text = await asyncio.to_thread(load_book_text, book_id, head_only=True)
+    except FileNotFoundError:
+        book_text = ""
+
+    book_context = _script_book_context(book_text)
+    course_title = outline.get("course_title", "")
+
+    def script_chunks() -> Iterator[str]:
+        parts: List[str] = []
+        for chunk in stream_lesson_script(
+            lesson=lesson,
+            book_context=book_context,
+            course_title=course_title,
+        ):
+            parts.append(chunk)
+            yield chunk
+
+        script_path = BOOKS_DIR / f"{book_id}_{lesson_id}_script.txt"
+        script_path.write_text("".join(parts), encoding="utf-8")
+        _write_fingerprint(
+            script_path, lesson_script_fingerprint(lesson, book_context, course_title)
+        )
+
+    return StreamingResponse(script_chunks(), media_type="text/plain; charset=utf-8")
+
+
+@app.post("/books/{book_id}/scripts/batch")
+async def generate_scripts_batch(book_id: str, regenerate: bool = False) -> Dict[str, Any]:
+    """
+    Generate scripts for every lesson in the outline with batched LLM calls
+    (several lessons per request) instead of one call per lesson. Lessons
+    whose saved script is still up to date are skipped, unless `regenerate`
+    is set.
+    """
     outline_path = BOOKS_DIR / f"{book_id}_outline.json"
     if not outline_path.exists():
         raise HTTPException(status_code=404, detail="Outline not found. Generate outline first.")
 
-    import json
-    outline = json.loads(outline_path.read_text(encoding="utf-8"))
+    outline = await asyncio.to_thread(_read_outline, outline_path)
+    lessons = outline.get("lessons", [])
+    course_title = outline.get("course_title", "")
+
+    try:
+        book_text = await asyncio.to_thread(load_book_text, book_id, head_only=True)
+    except FileNotFoundError:
+        book_text = ""
+    book_context = _script_book_context(book_text)
+
+    def script_path_for(lesson: Dict[str, Any]) -> Path:
+        return BOOKS_DIR / f"{book_id}_{lesson['id']}_script.txt"
+
+    if regenerate:
+        stale = lessons
+    else:
+        current = await asyncio.gather(*(
+            asyncio.to_thread(
+                _script_is_up_to_date, script_path_for(lesson), lesson, book_context, course_title
+            )
+            for lesson in lessons
+        ))
+        stale = [lesson for lesson, is_current in zip(lessons, current) if not is_current]
+
+    try:
+        scripts = await agenerate_lesson_scripts_batch(
+            lessons=stale,
+            book_context=book_context,
+            course_title=course_title,
+            cache=not regenerate,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate scripts: {e}")
 
-    # Find the lesson
-    lesson = None
-    for les in outline.get("lessons", []):
-        if les["id"] == lesson_id:
-            lesson = les
-            break
+    def save(lesson: Dict[str, Any]) -> None:
+        script_path = script_path_for(lesson)
+        script_path.write_text(scripts[lesson["id"]], encoding="utf-8")
+        _write_fingerprint(
+            script_path, lesson_script_batch_fingerprint(lesson, book_context, course_title)
+        )
 
-    if not lesson:
-        raise HTTPException(status_code=404, detail=f"Lesson {lesson_id} not found")
+    generated = [lesson for lesson in stale if lesson["id"] in scripts]
+    await asyncio.gather(*(asyncio.to_thread(save, lesson) for lesson in generated))
+
+    stale_ids = {lesson["id"] for lesson in stale}
+    return {
+        "book_id": book_id,
+        "lessons": [
+            {"lesson_id": lesson["id"], "script_length": len(scripts[lesson["id"]])}
+            for lesson in generated
+        ],
+        "cached": [lesson["id"] for lesson in lessons if lesson["id"] not in stale_ids],
+        "missing": [lesson["id"] for lesson in stale if lesson["id"] not in scripts],
+    }
+
+
+@app.post("/books/{book_id}/lessons/{lesson_id}/quiz")
+async def generate_quiz(book_id: str, lesson_id: str, regenerate: bool = False) -> Dict[str, Any]:
+    """
+    Generate quiz questions for a specific lesson. A saved quiz is reused
+    when its request is unchanged, unless `regenerate` is set.
+    """
+    _, lesson = await _load_outline_and_lesson(book_id, lesson_id)
+
+    quiz_path = BOOKS_DIR / f"{book_id}_{lesson_id}_quiz.json"
+    fingerprint = quiz_fingerprint(lesson)
+    if not regenerate and await asyncio.to_thread(_is_up_to_date, quiz_path, fingerprint):
+        questions = orjson.loads(await asyncio.to_thread(quiz_path.read_bytes))
+        return {
+            "book_id": book_id,
+            "lesson_id": lesson_id,
+            "questions": questions,
+            "cached": True,
+        }
 
     # Generate quiz
     try:
-        questions = generate_quiz_questions(lesson)
+        questions = await agenerate_quiz_questions(lesson, cache=not regenerate)
 
         # Save quiz
-        quiz_path = BOOKS_DIR / f"{book_id}_{lesson_id}_quiz.json"
-        quiz_path.write_text(json_dumps(questions), encoding="utf-8")
+        await asyncio.to_thread(quiz_path.write_bytes, json_bytes(questions))
+        await asyncio.to_thread(_write_fingerprint, quiz_path, fingerprint)
 
         return {
             "book_id": book_id,
@@ -250,10 +561,94 @@ async def generate_quiz(book_id: str, lesson_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to generate quiz: {e}")
 
 
+@app.post("/books/{book_id}/generate_all")
+async def generate_all_lessons(book_id: str) -> Dict[str, Any]:
+    """
+    Generate scripts and quizzes for every lesson in the outline concurrently.
+    At most LESSON_LLM_CONCURRENCY LLM calls are in flight at once.
+    """
+    outline_path = BOOKS_DIR / f"{book_id}_outline.json"
+    if not outline_path.exists():
+        raise HTTPException(status_code=404, detail="Outline not found. Generate outline first.")
+
+    outline = await asyncio.to_thread(_read_outline, outline_path)
+    lessons = outline.get("lessons", [])
+    course_title = outline.get("course_title", "")
+
+    try:
+        book_text = await asyncio.to_thread(load_book_text, book_id, head_only=True)
+    except FileNotFoundError:
+        book_text = ""
+
+    book_context = _script_book_context(book_text)
+    semaphore = asyncio.Semaphore(LESSON_LLM_CONCURRENCY)
+
+    def save_script(lesson: Dict[str, Any], script: str) -> int:
+        script_path = BOOKS_DIR / f"{book_id}_{lesson['id']}_script.txt"
+        script_path.write_text(script, encoding="utf-8")
+        _write_fingerprint(
+            script_path, lesson_script_fingerprint(lesson, book_context, course_title)
+        )
+        return len(script)
+
+    # Script requests are scheduled now, longest first, so they take the
+    # semaphore ahead of the (short) quiz requests created below
+    pending_scripts = agenerate_lesson_scripts(
+        lessons, book_context, course_title, semaphore=semaphore
+    )
+
+    async def scripts_for_all() -> List[Any]:
+        scripts = await pending_scripts
+        # Failed lessons keep their exception; the rest become saved lengths
+        results: List[Any] = list(scripts)
+        to_save = [i for i, script in enumerate(scripts) if isinstance(script, str)]
+        saved = await asyncio.gather(
+            *(asyncio.to_thread(save_script, lessons[i], scripts[i]) for i in to_save),
+            return_exceptions=True,
+        )
+        for i, result in zip(to_save, saved):
+            results[i] = result
+        return results
+
+    async def quiz_for(lesson: Dict[str, Any]) -> int:
+        async with semaphore:
+            questions = await agenerate_quiz_questions(lesson)
+        quiz_path = BOOKS_DIR / f"{book_id}_{lesson['id']}_quiz.json"
+        await asyncio.to_thread(quiz_path.write_bytes, json_bytes(questions))
+        await asyncio.to_thread(_write_fingerprint, quiz_path, quiz_fingerprint(lesson))
+        return len(questions)
+
+    script_results, *quiz_results = await asyncio.gather(
+        scripts_for_all(),
+        *(quiz_for(lesson) for lesson in lessons),
+        return_exceptions=True,
+    )
+    if isinstance(script_results, BaseException):
+        script_results = [script_results] * len(lessons)
+
+    summary = []
+    for lesson, script_result, quiz_result in zip(lessons, script_results, quiz_results):
+        entry: Dict[str, Any] = {"lesson_id": lesson["id"]}
+        if isinstance(script_result, BaseException):
+            entry["script_error"] = str(script_result)
+        else:
+            entry["script_length"] = script_result
+        if isinstance(quiz_result, BaseException):
+            entry["quiz_error"] = str(quiz_result)
+        else:
+            entry["questions"] = quiz_result
+        summary.append(entry)
+
+    return {
+        "book_id": book_id,
+        "lessons": summary,
+    }
+
+
 @app.post("/books/{book_id}/lessons/{lesson_index}/video")
 async def create_lesson_video(book_id: str, lesson_index: int) -> Dict[str, Any]:
     try:
-        video_path = generate_lesson_video(book_id, lesson_index)
+        video_path = await asyncio.to_thread(generate_lesson_video, book_id, lesson_index)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=f"Failed to generate video: {exc}") from exc
 
@@ -267,8 +662,10 @@ async def create_lesson_video(book_id: str, lesson_index: int) -> Dict[str, Any]
 @app.get("/heygen/avatars")
 async def get_avatars() -> Dict[str, Any]:
     """List available HeyGen avatars"""
+    from .video_utils import list_available_avatars, HeyGenError
+
     try:
-        avatars = list_available_avatars()
+        avatars = await asyncio.to_thread(list_available_avatars)
         return avatars
     except HeyGenError as e:
         raise HTTPException(status_code=500, detail=f"HeyGen API error: {e}")
@@ -277,8 +674,10 @@ async def get_avatars() -> Dict[str, Any]:
 @app.get("/heygen/voices")
 async def get_voices() -> Dict[str, Any]:
     """List available HeyGen voices"""
+    from .video_utils import list_available_voices, HeyGenError
+
     try:
-        voices = list_available_voices()
+        voices = await asyncio.to_thread(list_available_voices)
         return voices
     except HeyGenError as e:
         raise HTTPException(status_code=500, detail=f"HeyGen API error: {e}")
@@ -310,8 +709,14 @@ async def enhance_video_with_code_overlay(
         "layout": "avatar-corner"
     }
     """
+    from .video_enhancer import (
+        enhance_video_from_url,
+        check_ffmpeg_installed,
+        VideoEnhancerError,
+    )
+
     # Check FFmpeg is installed
-    if not check_ffmpeg_installed():
+    if not await asyncio.to_thread(check_ffmpeg_installed):
         raise HTTPException(
             status_code=500,
             detail="FFmpeg not installed. Run: brew install ffmpeg"
@@ -325,8 +730,7 @@ async def enhance_video_with_code_overlay(
             detail="Video not found. Generate video first."
         )
 
-    import json
-    video_meta = json.loads(video_meta_path.read_text(encoding="utf-8"))
+    video_meta = orjson.loads(await asyncio.to_thread(video_meta_path.read_bytes))
     video_url = video_meta.get("video_url")
 
     if not video_url:
@@ -335,12 +739,13 @@ async def enhance_video_with_code_overlay(
     # Enhance video
     try:
         output_dir = BOOKS_DIR / "enhanced_videos" / book_id
-        output_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
 
         # Convert Pydantic models to dicts
         code_snippets_list = [snippet.dict() for snippet in request.code_snippets]
 
-        enhanced_video_path = enhance_video_from_url(
+        enhanced_video_path = await asyncio.to_thread(
+            enhance_video_from_url,
             video_url=video_url,
             code_snippets=code_snippets_list,
             layout=request.layout,
@@ -356,7 +761,9 @@ async def enhance_video_with_code_overlay(
         }
 
         enhanced_meta_path = BOOKS_DIR / f"{book_id}_{lesson_id}_enhanced.json"
-        enhanced_meta_path.write_text(json_dumps(enhanced_meta), encoding="utf-8")
+        await asyncio.to_thread(
+            enhanced_meta_path.write_bytes, json_bytes(enhanced_meta)
+        )
 
         return {
             "book_id": book_id,
@@ -376,7 +783,9 @@ async def enhance_video_with_code_overlay(
 @app.get("/ffmpeg/status")
 async def check_ffmpeg_status() -> Dict[str, Any]:
     """Check if FFmpeg is installed and working"""
-    is_installed = check_ffmpeg_installed()
+    from .video_enhancer import check_ffmpeg_installed
+
+    is_installed = await asyncio.to_thread(check_ffmpeg_installed)
 
     return {
         "ffmpeg_installed": is_installed,
@@ -422,7 +831,7 @@ async def update_model_config(request: UpdateConfigRequest) -> Dict[str, Any]:
             return {
                 "success": True,
                 "message": f"Configuration updated to {request.provider} - {request.model}",
-                "config": config.get_current_llm_config()
+                "config": dict(config.get_current_llm_config())
             }
         else:
             raise HTTPException(status_code=400, detail="Failed to update configuration")
@@ -436,7 +845,7 @@ async def update_model_config(request: UpdateConfigRequest) -> Dict[str, Any]:
 @app.post("/config/test")
 async def test_connection() -> Dict[str, Any]:
     """Test the current AI model configuration"""
-    result = llm_client.test_connection()
+    result = await asyncio.to_thread(llm_client.test_connection)
 
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -444,6 +853,19 @@ async def test_connection() -> Dict[str, Any]:
     return result
 
 
+@app.get("/llm/cache/stats")
+async def get_llm_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counters and size of the LLM response cache"""
+    return llm_response_cache.get_stats()
+
+
+@app.delete("/llm/cache")
+async def clear_llm_cache() -> Dict[str, Any]:
+    """Drop every cached LLM response"""
+    removed = await asyncio.to_thread(llm_response_cache.clear)
+    return {"removed": removed}
+
+
 # ============================================================================
 # TTS Configuration Endpoints
 # ============================================================================
@@ -483,7 +905,7 @@ async def update_tts_config(request: UpdateTTSConfigRequest) -> Dict[str, Any]:
             return {
                 "success": True,
                 "message": f"TTS configuration updated to {request.provider} - {request.voice}",
-                "config": config.get_current_tts_config()
+                "config": dict(config.get_current_tts_config())
             }
         else:
             raise HTTPException(status_code=400, detail="Failed to update TTS configuration")
@@ -497,7 +919,7 @@ async def update_tts_config(request: UpdateTTSConfigRequest) -> Dict[str, Any]:
 @app.post("/config/tts/test")
 async def test_tts_connection() -> Dict[str, Any]:
     """Test the current TTS configuration"""
-    result = tts_client.test_connection()
+    result = await asyncio.to_thread(tts_client.test_connection)
 
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
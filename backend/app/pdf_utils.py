@@ -1,60 +1,270 @@
-import base64
-import json
+import gzip
+import hashlib
+import io
+import multiprocessing
+import os
 import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, List, Dict, Any, Optional
+from typing import TYPE_CHECKING, Iterable, Tuple, List, Dict, Any, Optional
 
-from openai import OpenAI
-from pypdf import PdfReader
+import orjson
+
+try:
+    # SIMD base64 kernels, same API as the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+from .vision_cache import NearDuplicateIndex, image_dhashes, vision_cache
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 BOOKS_DIR = BASE_DIR / "data" / "books"
 BOOKS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Initialize OpenAI client for image analysis
-_client: Optional[OpenAI] = None
+UPLOAD_COPY_CHUNK_BYTES = 1024 * 1024
+
+# Upper bound on extracted book text. Prompts only ever use a leading excerpt,
+# so pages past this point are not worth the extraction time.
+BOOK_TEXT_MAX_CHARS = 100_000
+
+# Leading characters returned by load_book_text(head_only=True); covers the
+# largest excerpt sent to the LLM (outline prompt)
+BOOK_HEAD_CHARS = 50_000
+
+# PDFs with fewer pages are extracted in-process; larger ones are split into
+# PAGES_PER_EXTRACT_TASK-page ranges across worker processes
+PARALLEL_EXTRACT_MIN_PAGES = 16
+PAGES_PER_EXTRACT_TASK = 8
+EXTRACT_WORKERS = os.cpu_count() or 1
+
+# Threads writing extracted images to disk
+IMAGE_WRITE_WORKERS = 8
+
+# Concurrent GPT-4 Vision requests while analysing a book's images
+VISION_CONCURRENCY = 16
 
-def _get_openai_client() -> OpenAI:
+# Images whose FLAT_IMAGE_SIDE px grayscale thumbnail has a pixel stddev below
+# FLAT_IMAGE_MAX_STDDEV are marked decorative without asking the vision model.
+# (A distinct-colour count is not used: 1-bit line-art diagrams have two.)
+FLAT_IMAGE_SIDE = 64
+FLAT_IMAGE_MAX_STDDEV = 8
+
+# Vision model calls per upload (cost/time cap); cached images don't count
+VISION_MAX_IMAGES = 50
+VISION_ANALYSIS_FAILED = "Image analysis failed"
+
+# Images at least this large are downscaled to VISION_MAX_SIDE px JPEGs
+# before upload; smaller ones are sent as-is
+VISION_REENCODE_MIN_BYTES = 100 * 1024
+VISION_MAX_SIDE = 768
+VISION_JPEG_QUALITY = 75
+
+# Identical for every image, so it goes first as the system message and the
+# image is the only part of the request that changes between calls
+_VISION_SYSTEM = """Analyze this image from a technical book. Describe what it shows in 1-2 sentences.
+Focus on:
+- If it's a diagram: what concept/architecture/flow does it illustrate?
+- If it's a chart/graph: what data does it show?
+- If it's code: what does the code do?
+- If it's a screenshot: what interface/tool is shown?
+- If it's decorative/logo: say "Decorative element" or "Logo"
+
+Be specific about technical concepts shown. Output ONLY the description, no preamble."""
+
+# Routes all image requests to the same prompt cache; bump when _VISION_SYSTEM changes
+VISION_PROMPT_CACHE_KEY = "vision_book_img_v1"
+
+# zlib's default level: near-max ratio on text, much cheaper than gzip's 9
+BOOK_TEXT_GZIP_LEVEL = 6
+
+# OpenAI client for image analysis, created (and the SDK imported) on first use
+_client: Optional["OpenAI"] = None
+
+def _get_openai_client() -> "OpenAI":
     global _client
     if _client is None:
+        from openai import OpenAI
+
         _client = OpenAI()
     return _client
 
 
+# Worker processes for text extraction, created on first use
+_extract_pool: Optional[ProcessPoolExecutor] = None
+
+
 def save_uploaded_pdf(uploaded_file) -> Tuple[str, Path]:
     """
-    Save incoming UploadFile to disk with a generated book_id.
+    Save incoming UploadFile to disk. The book_id is a hash of the PDF's
+    contents, so uploading the same book again maps to the same book_id.
     Returns (book_id, pdf_path).
     """
-    book_id = str(uuid.uuid4())
-    pdf_path = BOOKS_DIR / f"{book_id}.pdf"
+    digest = hashlib.blake2b(digest_size=16)
+    part_path = BOOKS_DIR / f"upload_{uuid.uuid4()}.pdf.part"
+
+    try:
+        with part_path.open("wb") as f:
+            # uploaded_file.file is a SpooledTemporaryFile; copy it in chunks
+            # rather than reading the whole PDF into memory
+            while chunk := uploaded_file.file.read(UPLOAD_COPY_CHUNK_BYTES):
+                f.write(chunk)
+                digest.update(chunk)
 
-    with pdf_path.open("wb") as f:
-        # uploaded_file.file is a SpooledTemporaryFile
-        f.write(uploaded_file.file.read())
+        book_id = digest.hexdigest()
+        pdf_path = BOOKS_DIR / f"{book_id}.pdf"
+        if pdf_path.exists():
+            part_path.unlink()
+        else:
+            os.replace(part_path, pdf_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
 
     return book_id, pdf_path
 
 
-def extract_text_from_pdf(pdf_path: Path, max_pages: int | None = None) -> str:
+def extract_text_from_pdf(
+    pdf_path: Path, max_pages: int | None = None, max_chars: int | None = None
+) -> str:
     """
     Extract plain text from a PDF file.
-    For v1, we can optionally limit to first `max_pages`.
+    For v1, we can optionally limit to first `max_pages`, and stop extracting
+    further pages once `max_chars` characters have been collected.
     """
-    reader = PdfReader(str(pdf_path))
-    text_chunks: list[str] = []
+    text, _ = extract_text_and_page_count(pdf_path, max_pages=max_pages, max_chars=max_chars)
+    return text
 
-    pages = reader.pages
-    if max_pages is not None:
-        pages = pages[:max_pages]
 
-    for page in pages:
-        page_text = page.extract_text() or ""
-        text_chunks.append(page_text)
+def extract_text_and_page_count(
+    pdf_path: Path, max_pages: int | None = None, max_chars: int | None = None
+) -> Tuple[str, int]:
+    """
+    Same as extract_text_from_pdf, but also returns the PDF's total page count.
+    """
+    page_texts, page_count = extract_page_texts(pdf_path, max_pages=max_pages, max_chars=max_chars)
+    return join_page_texts(page_texts, max_chars), page_count
+
+
+def extract_page_texts(
+    pdf_path: Path, max_pages: int | None = None, max_chars: int | None = None
+) -> Tuple[List[str], int]:
+    """
+    Text of each leading page (at least enough pages to cover max_chars), and
+    the PDF's total page count. Long PDFs are extracted in parallel worker
+    processes, a wave of page ranges at a time, so a max_chars cap still
+    stops extraction early.
+    """
+    page_count = _pdf_page_count(str(pdf_path))
+    last = page_count if max_pages is None else min(max_pages, page_count)
+
+    # Worker startup isn't worth it for short documents
+    if last < PARALLEL_EXTRACT_MIN_PAGES:
+        return _extract_page_range(str(pdf_path), 0, last), page_count
+
+    pool = _get_extract_pool()
+    wave_size = EXTRACT_WORKERS * PAGES_PER_EXTRACT_TASK
+    page_texts: list[str] = []
+    total_chars = 0
+    for wave_start in range(0, last, wave_size):
+        starts = range(wave_start, min(wave_start + wave_size, last), PAGES_PER_EXTRACT_TASK)
+        ends = [min(start + PAGES_PER_EXTRACT_TASK, last) for start in starts]
+        for chunk in pool.map(_extract_page_range, [str(pdf_path)] * len(ends), starts, ends):
+            page_texts.extend(chunk)
+            total_chars += sum(len(t) for t in chunk)
+        if max_chars is not None and total_chars >= max_chars:
+            break
 
+    return page_texts, page_count
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    global _extract_pool
+    if _extract_pool is None:
+        # spawn, not fork: the server process has live threads
+        _extract_pool = ProcessPoolExecutor(
+            max_workers=EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _extract_pool
+
+
+def join_page_texts(page_texts: Iterable[str], max_chars: int | None) -> str:
+    """Join page texts, stopping once max_chars characters have been collected"""
+    text_chunks: list[str] = []
+    total_chars = 0
+    for page_text in page_texts:
+        text_chunks.append(page_text)
+        total_chars += len(page_text)
+        if max_chars is not None and total_chars >= max_chars:
+            break
     return "\n\n".join(text_chunks)
 
 
+def _pdf_page_count(pdf_path: str) -> int:
+    try:
+        import fitz  # PyMuPDF
+
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"⚠️ PyMuPDF failed on {pdf_path}, falling back to pypdf: {e}")
+
+    from pypdf import PdfReader
+
+    return len(PdfReader(pdf_path).pages)
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """
+    Text of pages [start, end). Uses PyMuPDF, falling back to pypdf.
+    Module-level so it can run in a worker process.
+    """
+    try:
+        import fitz  # PyMuPDF
+
+        with fitz.open(pdf_path) as doc:
+            return [doc[i].get_text("text") for i in range(start, end)]
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"⚠️ PyMuPDF failed on {pdf_path}, falling back to pypdf: {e}")
+
+    from pypdf import PdfReader
+
+    pages = PdfReader(pdf_path).pages
+    return [pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _vision_image_payload(image_path: Path) -> Tuple[str, bytes]:
+    """
+    Media type and bytes to upload for an image. Low-detail vision only sees
+    a ~512px thumbnail, so large images are shrunk to a small JPEG first.
+    """
+    data = image_path.read_bytes()
+    media_type = "image/png" if image_path.suffix.lower() == ".png" else "image/jpeg"
+    if len(data) < VISION_REENCODE_MIN_BYTES:
+        return media_type, data
+
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as img:
+            img.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, "JPEG", quality=VISION_JPEG_QUALITY)
+        return "image/jpeg", buf.getvalue()
+    except Exception as e:
+        print(f"⚠️ Could not downscale {image_path.name}, sending original: {e}")
+        return media_type, data
+
+
 def _analyze_image_with_vision(image_path: Path) -> str:
     """
     Use GPT-4 Vision to analyze an image and describe its content.
@@ -66,33 +276,17 @@ def _analyze_image_with_vision(image_path: Path) -> str:
         if file_size < 5000:  # Less than 5KB
             return "Small decorative element or icon"
         
-        # Read and encode image
-        with open(image_path, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
-        
-        # Determine media type
-        ext = image_path.suffix.lower()
-        media_type = "image/png" if ext == ".png" else "image/jpeg"
+        media_type, image_bytes = _vision_image_payload(image_path)
+        image_data = base64.b64encode(image_bytes).decode("utf-8")
         
         client = _get_openai_client()
         response = client.chat.completions.create(
             model="gpt-4o-mini",  # Use gpt-4o-mini for cost efficiency
             messages=[
+                {"role": "system", "content": _VISION_SYSTEM},
                 {
                     "role": "user",
                     "content": [
-                        {
-                            "type": "text",
-                            "text": """Analyze this image from a technical book. Describe what it shows in 1-2 sentences.
-Focus on:
-- If it's a diagram: what concept/architecture/flow does it illustrate?
-- If it's a chart/graph: what data does it show?
-- If it's code: what does the code do?
-- If it's a screenshot: what interface/tool is shown?
-- If it's decorative/logo: say "Decorative element" or "Logo"
-
-Be specific about technical concepts shown. Output ONLY the description, no preamble."""
-                        },
                         {
                             "type": "image_url",
                             "image_url": {
@@ -105,6 +299,7 @@ Be specific about technical concepts shown. Output ONLY the description, no prea
             ],
             max_tokens=100,
             temperature=0.2,
+            extra_body={"prompt_cache_key": VISION_PROMPT_CACHE_KEY},
         )
         
         description = response.choices[0].message.content.strip()
@@ -112,32 +307,83 @@ Be specific about technical concepts shown. Output ONLY the description, no prea
         
     except Exception as e:
         print(f"⚠️ Vision analysis failed for {image_path.name}: {e}")
-        return "Image analysis failed"
+        return VISION_ANALYSIS_FAILED
+
+
+def _image_phash(image_path: Path) -> Optional[Tuple[int, int]]:
+    """(near-duplicate hash, vision cache key), or None if the image can't be read"""
+    try:
+        return image_dhashes(image_path)
+    except Exception as e:
+        print(f"⚠️ Could not hash {image_path.name}: {e}")
+        return None
+
+
+def _is_flat_image(image_path: Path) -> bool:
+    """
+    True for near-uniform images (dividers, backgrounds, solid blocks), judged
+    on a small grayscale thumbnail so no vision call is needed for them.
+    """
+    try:
+        from PIL import Image, ImageStat
+
+        with Image.open(image_path) as img:
+            img.draft("L", (FLAT_IMAGE_SIDE, FLAT_IMAGE_SIDE))  # JPEG: decode at reduced size
+            thumb = img.convert("L").resize((FLAT_IMAGE_SIDE, FLAT_IMAGE_SIDE), Image.NEAREST)
+    except Exception:
+        return False
+
+    return ImageStat.Stat(thumb).stddev[0] < FLAT_IMAGE_MAX_STDDEV
+
 
+def _set_image_description(img_meta: Dict[str, Any], description: str) -> None:
+    img_meta["description"] = description
+    # Skip decorative elements in future matching
+    lowered = description.lower()
+    img_meta["is_decorative"] = "decorative" in lowered or "logo" in lowered
 
-def extract_images_from_pdf(pdf_path: Path, book_id: str, analyze_images: bool = True) -> List[Dict[str, Any]]:
+
+def extract_images_from_pdf(
+    pdf_path: Path,
+    book_id: str,
+    analyze_images: bool = True,
+    page_texts: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """
     Extract images from a PDF file and save them to disk.
     Optionally analyzes images with GPT-4 Vision to understand their content.
+    `page_texts` (from extract_page_texts) supplies image context for the
+    pages it covers, so those pages aren't parsed a second time.
     Returns a list of image metadata with paths and descriptions.
     """
     images_dir = BOOKS_DIR / book_id / "images"
     images_dir.mkdir(parents=True, exist_ok=True)
     
+    from pypdf import PdfReader
+
     reader = PdfReader(str(pdf_path))
     image_metadata: List[Dict[str, Any]] = []
+    first_by_hash: Dict[str, Dict[str, Any]] = {}
     image_count = 0
+
+    # Writes go to a small pool so they overlap with decoding the next images
+    writer = ThreadPoolExecutor(max_workers=IMAGE_WRITE_WORKERS)
+    pending_writes: List[Tuple[Dict[str, Any], Future]] = []
     
     print(f"📷 Extracting images from PDF...")
     
     for page_num, page in enumerate(reader.pages):
-        # Get text context from the page for image association
-        page_text = page.extract_text() or ""
-        # Take first 300 chars as context
-        context = page_text[:300].strip()
-        
-        # Extract images from page
-        if hasattr(page, 'images'):
+        # Extract images from page; pages without any don't need their text
+        if page.images:
+            # Text context for image association, reusing the book's
+            # extracted text where it covers this page
+            if page_texts is not None and page_num < len(page_texts):
+                page_text = page_texts[page_num]
+            else:
+                page_text = page.extract_text() or ""
+            # Take first 300 chars as context
+            context = page_text[:300].strip()
+
             for img_idx, image in enumerate(page.images):
                 try:
                     # Determine file extension
@@ -148,15 +394,34 @@ def extract_images_from_pdf(pdf_path: Path, book_id: str, analyze_images: bool =
                         elif image.name.lower().endswith(".png"):
                             ext = ".png"
                     
+                    # Books repeat logos and decorations: identical bytes are
+                    # stored and analysed once, later copies point at the first
+                    digest = hashlib.blake2b(image.data, digest_size=16).hexdigest()
+                    first = first_by_hash.get(digest)
+                    if first is not None:
+                        image_metadata.append({
+                            "id": f"img_{image_count}",
+                            "filename": first["filename"],
+                            "path": first["path"],
+                            "relative_path": first["relative_path"],
+                            "page": page_num + 1,
+                            "context": context,
+                            "original_name": image.name or f"image_{image_count}",
+                            "description": "",  # Copied from the first occurrence
+                            "hash": digest,
+                            "duplicate_of": first["id"],
+                        })
+                        image_count += 1
+                        continue
+
                     # Save image
                     image_filename = f"page_{page_num + 1}_img_{img_idx + 1}{ext}"
                     image_path = images_dir / image_filename
                     
-                    with open(image_path, "wb") as f:
-                        f.write(image.data)
+                    write = writer.submit(image_path.write_bytes, image.data)
                     
                     # Store metadata
-                    image_metadata.append({
+                    img_meta = {
                         "id": f"img_{image_count}",
                         "filename": image_filename,
                         "path": str(image_path),
@@ -165,50 +430,100 @@ def extract_images_from_pdf(pdf_path: Path, book_id: str, analyze_images: bool =
                         "context": context,
                         "original_name": image.name or f"image_{image_count}",
                         "description": "",  # Will be filled by vision analysis
-                    })
+                        "hash": digest,
+                    }
+                    image_metadata.append(img_meta)
+                    first_by_hash[digest] = img_meta
+                    pending_writes.append((img_meta, write))
                     image_count += 1
                     
                 except Exception as e:
                     print(f"⚠️ Failed to extract image from page {page_num + 1}: {e}")
                     continue
     
-    print(f"📷 Extracted {len(image_metadata)} images")
+    writer.shutdown(wait=True)
+    failed = set()
+    for img_meta, write in pending_writes:
+        if write.exception() is not None:
+            print(f"⚠️ Failed to save image {img_meta['filename']}: {write.exception()}")
+            failed.add(img_meta["hash"])
+    if failed:
+        # Drop unsaved images along with their duplicates
+        image_metadata = [m for m in image_metadata if m["hash"] not in failed]
+        for digest in failed:
+            del first_by_hash[digest]
+
+    unique_images = list(first_by_hash.values())
+    print(f"📷 Extracted {len(image_metadata)} images ({len(unique_images)} unique)")
     
-    # Analyze images with vision model (sample for efficiency)
-    if analyze_images and image_metadata:
+    # Analyze images with vision model. Every unique image is considered in
+    # order; near-duplicates (same perceptual hash) and images already
+    # described in an earlier upload don't use up the vision budget.
+    if analyze_images and unique_images:
         print(f"🔍 Analyzing images with GPT-4 Vision...")
-        # Analyze a sample of images (max 50 for cost/time efficiency)
-        sample_size = min(50, len(image_metadata))
-        step = max(1, len(image_metadata) // sample_size)
-        
-        analyzed_count = 0
-        for i in range(0, len(image_metadata), step):
-            if analyzed_count >= sample_size:
-                break
-            
-            img_meta = image_metadata[i]
-            img_path = Path(img_meta["path"])
-            
-            if img_path.exists():
-                description = _analyze_image_with_vision(img_path)
-                img_meta["description"] = description
-                analyzed_count += 1
-                
-                # Skip decorative elements in future matching
-                if "decorative" in description.lower() or "logo" in description.lower():
-                    img_meta["is_decorative"] = True
-                else:
-                    img_meta["is_decorative"] = False
-                
+        to_analyze: List[Tuple[Dict[str, Any], Optional[int]]] = []
+        near_duplicates: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        representatives = NearDuplicateIndex()
+        from_cache = 0
+
+        # Vision calls are independent network round-trips: run them concurrently
+        with ThreadPoolExecutor(max_workers=VISION_CONCURRENCY) as pool:
+            paths = [Path(m["path"]) for m in unique_images]
+            phashes = pool.map(_image_phash, paths)
+            flat = pool.map(_is_flat_image, paths)
+
+            for img_meta, phash, is_flat in zip(unique_images, phashes, flat):
+                if is_flat:
+                    _set_image_description(img_meta, "Decorative element")
+                    continue
+
+                cache_key = None
+                if phash is not None:
+                    # Fuzzy matches stay within this upload; the cross-book
+                    # cache only reuses exact (256-bit) hash hits
+                    near_hash, cache_key = phash
+                    twin = representatives.find(near_hash)
+                    if twin is not None:
+                        near_duplicates.append((img_meta, twin))
+                        continue
+                    representatives.add(near_hash, img_meta)
+
+                    cached = vision_cache.get(cache_key)
+                    if cached is not None:
+                        _set_image_description(img_meta, cached)
+                        from_cache += 1
+                        continue
+
+                if len(to_analyze) < VISION_MAX_IMAGES:
+                    to_analyze.append((img_meta, cache_key))
+
+            descriptions = pool.map(
+                _analyze_image_with_vision, [Path(m["path"]) for m, _ in to_analyze]
+            )
+
+            for (img_meta, cache_key), description in zip(to_analyze, descriptions):
+                _set_image_description(img_meta, description)
+                if cache_key is not None and description != VISION_ANALYSIS_FAILED:
+                    vision_cache.set(cache_key, description)
                 print(f"  📸 {img_meta['filename']}: {description[:80]}...")
         
-        print(f"✅ Analyzed {analyzed_count} images with vision")
+        print(f"✅ Analyzed {len(to_analyze)} images with vision ({from_cache} from cache)")
+
+        for img_meta, twin in near_duplicates:
+            if "is_decorative" in twin:
+                _set_image_description(img_meta, twin["description"])
+
+        for img_meta in image_metadata:
+            if "duplicate_of" in img_meta:
+                first = first_by_hash[img_meta["hash"]]
+                img_meta["description"] = first["description"]
+                if "is_decorative" in first:
+                    img_meta["is_decorative"] = first["is_decorative"]
     
     # Save metadata to JSON
     if image_metadata:
         metadata_path = BOOKS_DIR / f"{book_id}_images.json"
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(image_metadata, f, indent=2)
+        metadata_path.write_bytes(orjson.dumps(image_metadata, option=orjson.OPT_INDENT_2))
         print(f"✅ Saved image metadata to {metadata_path.name}")
     
     return image_metadata
@@ -220,8 +535,7 @@ def load_book_images(book_id: str) -> List[Dict[str, Any]]:
     if not metadata_path.exists():
         return []
     try:
-        with open(metadata_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return orjson.loads(metadata_path.read_bytes())
     except Exception:
         return []
 
@@ -235,14 +549,63 @@ def get_image_path(book_id: str, image_filename: str) -> Optional[Path]:
 
 
 def save_book_text(book_id: str, text: str) -> Path:
-    txt_path = BOOKS_DIR / f"{book_id}.txt"
-    with txt_path.open("w", encoding="utf-8") as f:
+    """Save extracted book text gzip-compressed (plain text compresses ~3-4x)"""
+    txt_path = BOOKS_DIR / f"{book_id}.txt.gz"
+    with gzip.open(txt_path, "wt", encoding="utf-8", compresslevel=BOOK_TEXT_GZIP_LEVEL) as f:
         f.write(text)
     return txt_path
 
 
-def load_book_text(book_id: str) -> str:
-    txt_path = BOOKS_DIR / f"{book_id}.txt"
-    if not txt_path.exists():
-        raise FileNotFoundError(f"No text found for book_id={book_id}")
-    return txt_path.read_text(encoding="utf-8")
+def guess_book_title(text: str) -> Optional[str]:
+    """Crude guess for a book title: the first line of its text"""
+    first_line = text.split("\n", 1)[0].strip()[:200]
+    return first_line or None
+
+
+def save_book_meta(book_id: str, text: str, page_count: Optional[int] = None) -> Path:
+    """Persist small per-book metadata so requests don't re-scan the text"""
+    meta_path = BOOKS_DIR / f"{book_id}_meta.json"
+    meta = {
+        "title_guess": guess_book_title(text),
+        "char_count": len(text),
+        "page_count": page_count,
+    }
+    meta_path.write_bytes(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+    return meta_path
+
+
+def load_book_meta(book_id: str) -> Optional[Dict[str, Any]]:
+    """Load book metadata, or None for books uploaded before it existed"""
+    meta_path = BOOKS_DIR / f"{book_id}_meta.json"
+    try:
+        return orjson.loads(meta_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def load_book_text(book_id: str, head_only: bool = False) -> str:
+    """
+    Load a book's extracted text. With head_only, only the first
+    BOOK_HEAD_CHARS characters are decompressed and decoded. Results are
+    cached until the file changes.
+    """
+    text_path = BOOKS_DIR / f"{book_id}.txt.gz"
+    if not text_path.exists():
+        # Books uploaded before text was stored compressed
+        text_path = BOOKS_DIR / f"{book_id}.txt"
+        if not text_path.exists():
+            raise FileNotFoundError(f"No text found for book_id={book_id}")
+
+    return _read_book_text(str(text_path), text_path.stat().st_mtime_ns, head_only)
+
+
+@lru_cache(maxsize=64)
+def _read_book_text(path_str: str, mtime_ns: int, head_only: bool) -> str:
+    # mtime_ns is part of the cache key: re-uploading the text invalidates it
+    if path_str.endswith(".gz"):
+        f = gzip.open(path_str, "rt", encoding="utf-8")
+    else:
+        f = open(path_str, "r", encoding="utf-8")
+
+    with f:
+        return f.read(BOOK_HEAD_CHARS) if head_only else f.read()
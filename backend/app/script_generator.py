@@ -3,17 +3,41 @@ Lesson Script Generator
 Converts lesson outlines into conversational video scripts
 Supports TEST mode (1-2 mins) and PROD mode (6-8 mins)
 """
+import asyncio
+import json
 import os
-from typing import Dict, Any, List, Literal
-from dotenv import load_dotenv
+import re
+from typing import Dict, Any, Iterator, List, Literal, Optional, Tuple, Union
 
+from .config import config
 from .llm_client import llm_client
-
-load_dotenv()
+from .llm_utils import extract_json_object, truncate_for_model
 
 # Set video mode: 'test' for 1-2 min videos, 'prod' for 6-8 min videos
+# (.env is already loaded by the config import above)
 VIDEO_MODE = os.getenv("VIDEO_MODE", "test").lower()
 
+# Token budget for the book excerpt used to extract code examples
+CODE_EXAMPLE_BOOK_TOKENS = 750
+
+# Token caps for the lesson details in script prompts; outline text is
+# LLM-written, so an overlong summary or key point is possible
+SCRIPT_BOOK_CONTEXT_TOKENS = 500
+SCRIPT_SUMMARY_TOKENS = 200
+SCRIPT_KEY_POINT_TOKENS = 80
+
+# Output token budget per batched script request; lessons are grouped so
+# their combined script budgets fit, and the budget never exceeds the
+# current model's max_output_tokens (DEFAULT_MAX_OUTPUT_TOKENS if unlisted)
+SCRIPT_BATCH_MAX_TOKENS = 8000
+DEFAULT_MAX_OUTPUT_TOKENS = 4096
+
+# Concurrent LLM requests when generating for many lessons at once (provider rate limits)
+LESSON_LLM_CONCURRENCY = 8
+
+# Fenced code blocks in the code-example reply
+_CODE_BLOCK_RE = re.compile(r'```(?:python|javascript|js|py)?\n(.*?)```', re.DOTALL)
+
 
 # System prompt for TEST mode (short videos)
 SCRIPT_SYSTEM_PROMPT_TEST = """
@@ -68,47 +92,80 @@ Output only the script text, nothing else.
 """
 
 
-def generate_lesson_script(
+# Invariant part of the user prompt for each mode. It comes before the lesson
+# details, so the system prompt and this prefix are byte-identical across
+# lessons and provider-side prompt caches can match on them.
+SCRIPT_USER_PREFIX_TEST = """
+⚠️ MODE: TEST/DEMO (SHORT)
+
+CRITICAL: Write NATURAL conversational speech ONLY.
+DO NOT include [SHOW_CODE], [PAUSE], [SHOW_DIAGRAM] or ANY markers in the script.
+The avatar should speak like a real teacher, not read stage directions.
+
+Remember:
+- Start with a quick hook
+- Speak naturally and conversationally
+- When discussing code, just say "here's an example" or "let's look at this"
+- End with a brief summary
+- **Keep it 1-2 minutes of speaking time (~200-400 words MAX)**
+- Focus on ONE main concept only - skip examples and details
+
+GOOD example: "Variables store data. For example, we can write name equals Alice, or age equals 25."
+BAD example: "Variables store data. [SHOW_CODE] See this code. [PAUSE]"
+"""
+
+SCRIPT_USER_PREFIX_PROD = """
+⚠️ MODE: PRODUCTION (FULL)
+
+CRITICAL: Write NATURAL conversational speech ONLY.
+DO NOT include [SHOW_CODE], [PAUSE], [SHOW_DIAGRAM] or ANY markers in the script.
+The avatar should speak like a real teacher, not read stage directions.
+
+Remember:
+- Start with an engaging hook
+- Speak naturally and conversationally
+- When discussing code, just say "here's an example" or "let's look at this"
+- End with a clear summary
+- **Keep it 6-8 minutes of speaking time (~1200-1600 words)**
+- Cover all key points with examples and explanations
+
+GOOD example: "Variables store data. For example, we can write name equals Alice, or age equals 25."
+BAD example: "Variables store data. [SHOW_CODE] See this code. [PAUSE]"
+"""
+
+
+# Per-mode (system prompt, user prefix, max output tokens), resolved once
+_SCRIPT_SETTINGS_TEST = (SCRIPT_SYSTEM_PROMPT_TEST, SCRIPT_USER_PREFIX_TEST, 600)  # ~200-400 words for 1-2 min video
+_SCRIPT_SETTINGS_PROD = (SCRIPT_SYSTEM_PROMPT_PROD, SCRIPT_USER_PREFIX_PROD, 2500)  # ~1200-1600 words for 6-8 min video
+
+
+def _build_script_request(
     lesson: Dict[str, Any],
-    book_context: str = "",
-    course_title: str = "",
-    mode: Literal["test", "prod"] = None
-) -> str:
+    book_context: str,
+    course_title: str,
+    mode: Optional[Literal["test", "prod"]],
+) -> Tuple[List[Dict[str, str]], int, str]:
     """
-    Generate a video script for a lesson
-
-    Args:
-        lesson: Lesson dictionary with id, title, summary, key_points
-        book_context: Optional context from the book (code examples, etc.)
-        course_title: Optional course title for context
-        mode: 'test' for 1-2 min videos (FREE tier), 'prod' for 6-8 min videos
-              If None, uses VIDEO_MODE env var (defaults to 'test')
+    Build the LLM request for a lesson script
 
     Returns:
-        Script text ready for video generation
+        (messages, max_tokens, script_mode)
     """
     # Determine mode (allow override via parameter)
     script_mode = mode if mode is not None else VIDEO_MODE
 
-    # Select appropriate system prompt and settings based on mode
-    if script_mode == "test":
-        system_prompt = SCRIPT_SYSTEM_PROMPT_TEST
-        max_tokens = 600  # ~200-400 words for 1-2 min video
-        time_guidance = "1-2 minutes of speaking time (~200-400 words MAX)"
-        detail_level = "Focus on ONE main concept only - skip examples and details"
-    else:  # prod mode
-        system_prompt = SCRIPT_SYSTEM_PROMPT_PROD
-        max_tokens = 2500  # ~1200-1600 words for 6-8 min video
-        time_guidance = "6-8 minutes of speaking time (~1200-1600 words)"
-        detail_level = "Cover all key points with examples and explanations"
-
-    # Build the prompt
-    user_prompt = f"""
+    # Select appropriate prompts and settings based on mode
+    system_prompt, user_prefix, max_tokens = (
+        _SCRIPT_SETTINGS_TEST if script_mode == "test" else _SCRIPT_SETTINGS_PROD
+    )
+
+    # Lesson-specific details go after the invariant prefix
+    user_prompt = user_prefix + f"""
 Create a video script for this lesson:
 
 Course: {course_title if course_title else 'Technical Programming Course'}
 Lesson Title: {lesson['title']}
-Summary: {lesson['summary']}
+Summary: {truncate_for_model(lesson['summary'], config.model, SCRIPT_SUMMARY_TOKENS)}
 
 Key Points to Cover:
 """
@@ -118,41 +175,66 @@ Key Points to Cover:
     if script_mode == "test":
         key_points = key_points[:2]  # Only first 2 points for test mode
 
-    for i, point in enumerate(key_points, 1):
-        user_prompt += f"{i}. {point}\n"
+    user_prompt += "".join(
+        f"{i}. {truncate_for_model(point, config.model, SCRIPT_KEY_POINT_TOKENS)}\n"
+        for i, point in enumerate(key_points, 1)
+    )
 
     # Only add book context in PROD mode
     if book_context and script_mode == "prod":
-        user_prompt += f"\n\nBook Context (for reference):\n{book_context[:2000]}"
+        excerpt = truncate_for_model(book_context, config.model, SCRIPT_BOOK_CONTEXT_TOKENS)
+        user_prompt += f"\n\nBook Context (for reference):\n{excerpt}"
 
-    user_prompt += f"""
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    return messages, max_tokens, script_mode
 
-⚠️ MODE: {'TEST/DEMO (SHORT)' if script_mode == 'test' else 'PRODUCTION (FULL)'}
 
-CRITICAL: Write NATURAL conversational speech ONLY.
-DO NOT include [SHOW_CODE], [PAUSE], [SHOW_DIAGRAM] or ANY markers in the script.
-The avatar should speak like a real teacher, not read stage directions.
+def lesson_script_fingerprint(
+    lesson: Dict[str, Any],
+    book_context: str = "",
+    course_title: str = "",
+    mode: Optional[Literal["test", "prod"]] = None,
+) -> str:
+    """Fingerprint of the script request for a lesson under the current model"""
+    messages, max_tokens, _ = _build_script_request(lesson, book_context, course_title, mode)
+    return llm_client.request_fingerprint(messages, temperature=0.7, max_tokens=max_tokens)
 
-Remember:
-- Start with {'a quick hook' if script_mode == 'test' else 'an engaging hook'}
-- Speak naturally and conversationally
-- When discussing code, just say "here's an example" or "let's look at this"
-- End with a {'brief' if script_mode == 'test' else 'clear'} summary
-- **Keep it {time_guidance}**
-- {detail_level}
 
-GOOD example: "Variables store data. For example, we can write name equals Alice, or age equals 25."
-BAD example: "Variables store data. [SHOW_CODE] See this code. [PAUSE]"
-"""
+def generate_lesson_script(
+    lesson: Dict[str, Any],
+    book_context: str = "",
+    course_title: str = "",
+    mode: Literal["test", "prod"] = None,
+    cache: bool = True,
+) -> str:
+    """
+    Generate a video script for a lesson
+
+    Args:
+        lesson: Lesson dictionary with id, title, summary, key_points
+        book_context: Optional context from the book (code examples, etc.)
+        course_title: Optional course title for context
+        mode: 'test' for 1-2 min videos (FREE tier), 'prod' for 6-8 min videos
+              If None, uses VIDEO_MODE env var (defaults to 'test')
+        cache: Reuse a cached response to an identical request; pass False
+               to force a fresh script
+
+    Returns:
+        Script text ready for video generation
+    """
+    messages, max_tokens, script_mode = _build_script_request(
+        lesson, book_context, course_title, mode
+    )
 
     # Call LLM via unified client
     script = llm_client.chat_completion(
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
+        messages=messages,
         temperature=0.7,
         max_tokens=max_tokens,
+        cache=cache,
     )
 
     # Add mode indicator to script metadata (for debugging)
@@ -161,6 +243,265 @@ BAD example: "Variables store data. [SHOW_CODE] See this code. [PAUSE]"
     return script
 
 
+async def agenerate_lesson_script(
+    lesson: Dict[str, Any],
+    book_context: str = "",
+    course_title: str = "",
+    mode: Literal["test", "prod"] = None,
+    cache: bool = True,
+) -> str:
+    """Async version of generate_lesson_script"""
+    messages, max_tokens, script_mode = _build_script_request(
+        lesson, book_context, course_title, mode
+    )
+
+    script = await llm_client.achat_completion(
+        messages=messages,
+        temperature=0.7,
+        max_tokens=max_tokens,
+        cache=cache,
+    )
+
+    print(f"📝 Generated script in {script_mode.upper()} mode: {len(script)} chars (~{len(script.split())} words)")
+
+    return script
+
+
+def _predicted_script_tokens(lesson: Dict[str, Any], script_mode: str) -> int:
+    """Rough output length of a lesson script, used to order concurrent requests"""
+    if script_mode == "test":
+        return 200
+    return 400 + 200 * len(lesson.get("key_points", []))
+
+
+def agenerate_lesson_scripts(
+    lessons: List[Dict[str, Any]],
+    book_context: str = "",
+    course_title: str = "",
+    mode: Literal["test", "prod"] = None,
+    cache: bool = True,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> "asyncio.Future[List[Union[str, BaseException]]]":
+    """
+    Generate one script per lesson with concurrent single-lesson requests,
+    at most LESSON_LLM_CONCURRENCY in flight at once; pass `semaphore` to
+    share that limit with other calls. Lessons expected to take longest
+    start first, so a long script isn't left running alone at the end.
+
+    The requests are scheduled as soon as this is called (it must run inside
+    an event loop), so they queue on a shared semaphore ahead of anything
+    the caller schedules afterwards.
+
+    Returns:
+        Awaitable of the scripts in the order of `lessons`; a lesson whose
+        request failed gets its exception instead
+    """
+    script_mode = mode if mode is not None else VIDEO_MODE
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(LESSON_LLM_CONCURRENCY)
+
+    async def generate(lesson: Dict[str, Any]) -> str:
+        async with semaphore:
+            return await agenerate_lesson_script(
+                lesson, book_context, course_title, script_mode, cache=cache
+            )
+
+    # Tasks run, and so reach the semaphore, in creation order
+    order = sorted(
+        range(len(lessons)),
+        key=lambda i: _predicted_script_tokens(lessons[i], script_mode),
+        reverse=True,
+    )
+    tasks: List[Optional[asyncio.Task]] = [None] * len(lessons)
+    for i in order:
+        tasks[i] = asyncio.ensure_future(generate(lessons[i]))
+    return asyncio.gather(*tasks, return_exceptions=True)
+
+
+SCRIPT_BATCH_OUTPUT_INSTRUCTION = """
+You will be given several lessons. Write a separate script for EACH lesson.
+
+Respond with STRICT JSON: one object mapping each lesson id to its script text,
+for example {"lesson_1": "script text", "lesson_2": "script text"}.
+Do not include any extra text, comments, or markdown.
+"""
+
+_SCRIPT_BATCH_SYSTEM_PROMPT_TEST = SCRIPT_SYSTEM_PROMPT_TEST.replace(
+    "Output only the script text, nothing else.", SCRIPT_BATCH_OUTPUT_INSTRUCTION
+)
+_SCRIPT_BATCH_SYSTEM_PROMPT_PROD = SCRIPT_SYSTEM_PROMPT_PROD.replace(
+    "Output only the script text, nothing else.", SCRIPT_BATCH_OUTPUT_INSTRUCTION
+)
+
+
+def _build_script_batch_request(
+    lessons: List[Dict[str, Any]],
+    book_context: str,
+    course_title: str,
+    script_mode: str,
+) -> Tuple[List[Dict[str, str]], int]:
+    """
+    Build one LLM request covering several lesson scripts
+
+    Returns:
+        (messages, max_tokens)
+    """
+    if script_mode == "test":
+        system_prompt, user_prefix = _SCRIPT_BATCH_SYSTEM_PROMPT_TEST, SCRIPT_USER_PREFIX_TEST
+    else:
+        system_prompt, user_prefix = _SCRIPT_BATCH_SYSTEM_PROMPT_PROD, SCRIPT_USER_PREFIX_PROD
+
+    # Shared instructions and book context go in once, not once per lesson
+    user_prompt = user_prefix + "\n"
+    if book_context and script_mode == "prod":
+        excerpt = truncate_for_model(book_context, config.model, SCRIPT_BOOK_CONTEXT_TOKENS)
+        user_prompt += f"Book Context (for reference):\n{excerpt}\n\n"
+
+    max_tokens = 0
+    for lesson in lessons:
+        messages, lesson_max_tokens, _ = _build_script_request(
+            lesson, "", course_title, script_mode
+        )
+        lesson_prompt = messages[1]["content"].removeprefix(user_prefix)
+        user_prompt += f"=== Lesson id: {lesson['id']} ===\n{lesson_prompt}\n"
+        max_tokens += lesson_max_tokens
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    return messages, max_tokens
+
+
+def lesson_script_batch_fingerprint(
+    lesson: Dict[str, Any],
+    book_context: str = "",
+    course_title: str = "",
+    mode: Optional[Literal["test", "prod"]] = None,
+) -> str:
+    """
+    Fingerprint for a script written by agenerate_lesson_scripts_batch.
+    The batched prompt differs from the single-lesson one, so it is kept
+    distinct from lesson_script_fingerprint; callers treat a saved script
+    matching either one as up to date.
+    """
+    script_mode = mode if mode is not None else VIDEO_MODE
+    messages, max_tokens = _build_script_batch_request(
+        [lesson], book_context, course_title, script_mode
+    )
+    return llm_client.request_fingerprint(messages, temperature=0.7, max_tokens=max_tokens)
+
+
+def _script_batch_token_budget() -> int:
+    """Output tokens one batched request may ask for under the current model"""
+    model_info = config.get_current_llm_config()["model_info"]
+    return min(
+        SCRIPT_BATCH_MAX_TOKENS,
+        model_info.get("max_output_tokens", DEFAULT_MAX_OUTPUT_TOKENS),
+    )
+
+
+def _parse_script_batch_response(content: str) -> Dict[str, str]:
+    """Pull the {lesson_id: script} object out of the model's reply"""
+    try:
+        scripts = json.loads(content)
+    except json.JSONDecodeError:
+        json_str = extract_json_object(content)
+        if json_str is None:
+            return {}
+        try:
+            scripts = json.loads(json_str)
+        except json.JSONDecodeError:
+            return {}
+
+    if not isinstance(scripts, dict):
+        return {}
+    return {str(k): v for k, v in scripts.items() if isinstance(v, str)}
+
+
+async def agenerate_lesson_scripts_batch(
+    lessons: List[Dict[str, Any]],
+    book_context: str = "",
+    course_title: str = "",
+    mode: Literal["test", "prod"] = None,
+    cache: bool = True,
+) -> Dict[str, str]:
+    """
+    Generate scripts for several lessons with as few LLM calls as possible.
+    Lessons are grouped to fit the model's output budget and groups run
+    concurrently; a failed group doesn't discard the others.
+
+    Returns:
+        {lesson_id: script}; lessons the model skipped or whose group
+        failed are missing
+
+    Raises:
+        The first group's error if every group failed
+    """
+    if not lessons:
+        return {}
+
+    script_mode = mode if mode is not None else VIDEO_MODE
+    _, lesson_max_tokens, _ = _build_script_request(lessons[0], "", course_title, script_mode)
+    group_size = max(1, _script_batch_token_budget() // lesson_max_tokens)
+
+    async def generate_group(group: List[Dict[str, Any]]) -> Dict[str, str]:
+        messages, max_tokens = _build_script_batch_request(
+            group, book_context, course_title, script_mode
+        )
+        content = await llm_client.achat_completion(
+            messages=messages,
+            temperature=0.7,
+            max_tokens=max_tokens,
+            cache=cache,
+            json_mode=True,
+        )
+        return _parse_script_batch_response(content)
+
+    results = await asyncio.gather(
+        *(
+            generate_group(lessons[i : i + group_size])
+            for i in range(0, len(lessons), group_size)
+        ),
+        return_exceptions=True,
+    )
+
+    scripts: Dict[str, str] = {}
+    errors: List[BaseException] = []
+    for group_scripts in results:
+        if isinstance(group_scripts, BaseException):
+            print(f"⚠️ Batched script request failed: {group_scripts}")
+            errors.append(group_scripts)
+        else:
+            scripts.update(group_scripts)
+    if errors and len(errors) == len(results):
+        raise errors[0]
+
+    print(f"📝 Generated {len(scripts)}/{len(lessons)} scripts in {script_mode.upper()} mode ({len(results)} batched calls)")
+
+    return scripts
+
+
+def stream_lesson_script(
+    lesson: Dict[str, Any],
+    book_context: str = "",
+    course_title: str = "",
+    mode: Literal["test", "prod"] = None
+) -> Iterator[str]:
+    """
+    Same as generate_lesson_script, but yields the script text in chunks
+    as the model generates it
+    """
+    messages, max_tokens, _ = _build_script_request(
+        lesson, book_context, course_title, mode
+    )
+    yield from llm_client.chat_completion_stream(
+        messages=messages,
+        temperature=0.7,
+        max_tokens=max_tokens,
+    )
+
+
 def extract_code_examples(book_text: str, lesson_topic: str) -> List[str]:
     """
     Extract relevant code examples from book text for a specific lesson
@@ -172,11 +513,14 @@ def extract_code_examples(book_text: str, lesson_topic: str) -> List[str]:
     Returns:
         List of code snippets
     """
+    excerpt = truncate_for_model(
+        book_text, config.model, CODE_EXAMPLE_BOOK_TOKENS
+    )
     prompt = f"""
 From the following book text, extract 2-4 relevant code examples for the lesson topic: "{lesson_topic}"
 
 Book text:
-{book_text[:3000]}
+{excerpt}
 
 Return only the code examples, one per line, formatted as:
 CODE_EXAMPLE_1:
@@ -197,29 +541,21 @@ CODE_EXAMPLE_2:
         ],
         temperature=0.3,
         max_tokens=1500,
+        cache=True,
     )
 
     # Parse the response to extract code blocks
     code_examples = []
 
     # Simple parsing - look for code blocks
-    import re
-    code_blocks = re.findall(r'```(?:python|javascript|js|py)?\n(.*?)```', content, re.DOTALL)
+    code_blocks = _CODE_BLOCK_RE.findall(content)
     code_examples.extend(code_blocks)
 
     return code_examples
 
 
-def generate_quiz_questions(lesson: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """
-    Generate quiz questions for a lesson
-
-    Args:
-        lesson: Lesson dictionary with title, summary, key_points
-
-    Returns:
-        List of quiz questions with multiple choice answers
-    """
+def _build_quiz_messages(lesson: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Build the LLM request for a lesson's quiz questions"""
     prompt = f"""
 Create 4 multiple-choice quiz questions for this lesson:
 
@@ -229,8 +565,7 @@ Summary: {lesson['summary']}
 Key Points:
 """
 
-    for point in lesson['key_points']:
-        prompt += f"- {point}\n"
+    prompt += "".join(f"- {point}\n" for point in lesson['key_points'])
 
     prompt += """
 
@@ -258,29 +593,66 @@ Format as JSON:
 Mix conceptual and practical questions.
 """
 
+    return [
+        {"role": "system", "content": "You create quiz questions for technical courses."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_quiz_response(content: str) -> List[Dict[str, Any]]:
+    """Pull the JSON array of questions out of the model's reply"""
+    # Decode in place from each '[' until one parses as a list; unlike
+    # slicing to the last ']', a ']' later in the reply cannot break it
+    decoder = json.JSONDecoder()
+    start = content.find('[')
+    while start != -1:
+        try:
+            questions, _ = decoder.raw_decode(content, start)
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(questions, list):
+                return questions
+        start = content.find('[', start + 1)
+
+    # Return empty list if parsing fails
+    return []
+
+
+def quiz_fingerprint(lesson: Dict[str, Any]) -> str:
+    """Fingerprint of the quiz request for a lesson under the current model"""
+    return llm_client.request_fingerprint(
+        _build_quiz_messages(lesson), temperature=0.5, max_tokens=1500
+    )
+
+
+def generate_quiz_questions(lesson: Dict[str, Any], cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    Generate quiz questions for a lesson
+
+    Args:
+        lesson: Lesson dictionary with title, summary, key_points
+        cache: Reuse a cached response to an identical request; pass False
+               to force fresh questions
+
+    Returns:
+        List of quiz questions with multiple choice answers
+    """
     content = llm_client.chat_completion(
-        messages=[
-            {"role": "system", "content": "You create quiz questions for technical courses."},
-            {"role": "user", "content": prompt},
-        ],
+        messages=_build_quiz_messages(lesson),
         temperature=0.5,
         max_tokens=1500,
+        cache=cache,
     )
+    return _parse_quiz_response(content)
 
-    # Parse JSON response
-    import json
 
-    # Try to extract JSON from response
-    try:
-        # Look for JSON array in the response
-        start = content.find('[')
-        end = content.rfind(']') + 1
-        if start != -1 and end > start:
-            json_str = content[start:end]
-            questions = json.loads(json_str)
-            return questions
-    except json.JSONDecodeError:
-        pass
-
-    # Return empty list if parsing fails
-    return []
\ No newline at end of file
+async def agenerate_quiz_questions(lesson: Dict[str, Any], cache: bool = True) -> List[Dict[str, Any]]:
+    """Async version of generate_quiz_questions"""
+    content = await llm_client.achat_completion(
+        messages=_build_quiz_messages(lesson),
+        temperature=0.5,
+        max_tokens=1500,
+        cache=cache,
+    )
+    return _parse_quiz_response(content)
@@ -0,0 +1,16 @@
+"""
+Helpers for running the CLI tools (ffmpeg, ffprobe, npx) the pipeline shells out to
+"""
+import shutil
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def executable(name: str) -> str:
+    """Absolute path of a CLI tool, resolved on PATH once per process"""
+    return shutil.which(name) or name
+
+
+# Our fds are non-inheritable (PEP 446), so passing close_fds=False is safe;
+# it skips the fd sweep and lets subprocess use posix_spawn instead of fork
+SPAWN_KWARGS = {"close_fds": False}
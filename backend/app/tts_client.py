@@ -2,9 +2,179 @@
 Unified TTS (Text-to-Speech) client wrapper
 Abstracts API calls to OpenAI TTS, ElevenLabs, and Google Cloud TTS
 """
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from .config import config
+from .subprocess_utils import SPAWN_KWARGS, executable
+
+# Long texts are synthesized in chunks of about this many characters, split at
+# sentence boundaries. At most TTS_CONCURRENCY provider requests are in flight
+# per process, however many callers (e.g. parallel slides) fan out at once.
+TTS_CHUNK_CHARS = 800
+TTS_CONCURRENCY = 8
+_provider_slots = threading.BoundedSemaphore(TTS_CONCURRENCY)
+
+# Providers whose chunked output joins cleanly; ElevenLabs intonation drifts
+# at chunk boundaries, so it always gets the whole text in one request
+_CHUNKABLE_PROVIDERS = {"openai", "google_tts"}
+
+# Synthesized audio keyed by (provider, model, voice, text), so unchanged
+# narration is never paid for twice. Kept next to (not inside) data/books so
+# it is never served by /static/books; least recently used files are pruned
+# once the cache grows past TTS_CACHE_MAX_BYTES.
+TTS_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "tts_cache"
+TTS_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+# A prune frees space down to this many bytes, so the next one is many stores away
+TTS_CACHE_PRUNE_TO_BYTES = TTS_CACHE_MAX_BYTES * 9 // 10
+
+# Running size of the cache directory, from one scan on the first store;
+# the directory is only rescanned when a store pushes it past the cap
+_tts_cache_lock = threading.Lock()
+_tts_cache_bytes: Optional[int] = None
+
+# Successful connection checks are reused for this long, per provider and key
+TTS_CHECK_TTL_SECONDS = 300
+_connection_checks: Dict[Tuple[str, str], float] = {}
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+# Provider clients, built once per key and shared across threads so
+# connections (and Google's credential loading) are reused between calls
+
+
+@lru_cache(maxsize=4)
+def _openai_client(api_key: str) -> Any:
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _elevenlabs_client(api_key: str) -> Any:
+    try:
+        from elevenlabs.client import ElevenLabs
+    except ImportError:
+        raise ImportError(
+            "elevenlabs package not installed. Install with: pip install elevenlabs"
+        )
+
+    return ElevenLabs(api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _google_tts_client(credentials: str) -> Any:
+    """
+    `credentials` is a credentials JSON file path (any type Application
+    Default Credentials accepts: service account, authorized user, external
+    account) or an API key
+    """
+    try:
+        from google.cloud import texttospeech
+        import google.auth
+    except ImportError:
+        raise ImportError(
+            "google-cloud-texttospeech package not installed. "
+            "Install with: pip install google-cloud-texttospeech"
+        )
+
+    if os.path.isfile(credentials):
+        # The client adds its default scopes, as it would for ADC
+        loaded, _ = google.auth.load_credentials_from_file(credentials)
+        return texttospeech.TextToSpeechClient(credentials=loaded)
+    return texttospeech.TextToSpeechClient(client_options={"api_key": credentials})
+
+
+@lru_cache(maxsize=32)
+def _google_tts_params(voice: str) -> Tuple[Any, Any]:
+    """(VoiceSelectionParams, AudioConfig) for a voice like "en-US-Neural2-A"; MP3 for every model"""
+    from google.cloud import texttospeech
+
+    voice_params = texttospeech.VoiceSelectionParams(
+        language_code="-".join(voice.split("-", 2)[:2]),  # e.g., "en-US"
+        name=voice,
+    )
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MP3,
+        speaking_rate=1.0,
+        pitch=0.0,
+    )
+    return voice_params, audio_config
+
+
+def _tts_cache_path(provider: str, model: str, voice: str, text: str) -> Path:
+    key = hashlib.sha256(f"{provider}|{model}|{voice}|{text}".encode("utf-8")).hexdigest()
+    return TTS_CACHE_DIR / f"{key}.mp3"
+
+
+def _store_in_tts_cache(audio_path: Path, cached_path: Path) -> None:
+    cached_path.parent.mkdir(parents=True, exist_ok=True)
+    # Copy then rename, so concurrent readers never see a partial file
+    temp_path = cached_path.with_name(f"{cached_path.name}.{uuid.uuid4().hex}.tmp")
+    shutil.copyfile(audio_path, temp_path)
+    size = temp_path.stat().st_size
+    os.replace(temp_path, cached_path)
+
+    global _tts_cache_bytes
+    with _tts_cache_lock:
+        if _tts_cache_bytes is None:
+            _tts_cache_bytes = _prune_tts_cache()
+            return
+        # A concurrent store of the same entry is counted twice; the next
+        # prune's rescan corrects the total
+        _tts_cache_bytes += size
+        if _tts_cache_bytes > TTS_CACHE_MAX_BYTES:
+            _tts_cache_bytes = _prune_tts_cache()
+
+
+def _prune_tts_cache() -> int:
+    """
+    Drop least recently used entries (by mtime, refreshed on every hit) until
+    the cache is within TTS_CACHE_PRUNE_TO_BYTES, if it is past the size cap.
+    Returns the cache size left.
+    """
+    entries = []
+    for path in TTS_CACHE_DIR.glob("*.mp3"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    if total <= TTS_CACHE_MAX_BYTES:
+        return total
+    for _, size, path in sorted(entries):
+        if total <= TTS_CACHE_PRUNE_TO_BYTES:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+    return total
+
+
+def _split_sentences(text: str, max_chars: int) -> List[str]:
+    """Group whole sentences into chunks of at most max_chars (longer sentences stand alone)"""
+    chunks: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 class TTSClient:
@@ -19,6 +189,7 @@ class TTSClient:
         output_path: Path,
         voice: Optional[str] = None,
         model: Optional[str] = None,
+        cache: bool = True,
     ) -> Path:
         """
         Synthesize speech from text and save to file
@@ -28,6 +199,7 @@ class TTSClient:
             output_path: Path where audio file will be saved
             voice: Optional voice override (uses configured voice if not provided)
             model: Optional model override (uses configured model if not provided)
+            cache: Reuse (and store) audio for identical provider/model/voice/text
 
         Returns:
             Path to the generated audio file
@@ -47,15 +219,83 @@ class TTSClient:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        cached_path = _tts_cache_path(provider, model, voice, text) if cache else None
+        if cached_path is not None and cached_path.exists():
+            try:
+                shutil.copyfile(cached_path, output_path)
+                os.utime(cached_path)  # mark as recently used
+                return output_path
+            except FileNotFoundError:
+                pass  # pruned meanwhile; synthesize instead
+
         # Route to appropriate provider
-        if provider == "openai":
-            return self._openai_tts(text, output_path, voice, model, api_key)
-        elif provider == "elevenlabs":
-            return self._elevenlabs_tts(text, output_path, voice, model, api_key)
-        elif provider == "google_tts":
-            return self._google_tts(text, output_path, voice, model, api_key)
-        else:
-            raise ValueError(f"Unsupported TTS provider: {provider}")
+        with _provider_slots:
+            if provider == "openai":
+                self._openai_tts(text, output_path, voice, model, api_key)
+            elif provider == "elevenlabs":
+                self._elevenlabs_tts(text, output_path, voice, model, api_key)
+            elif provider == "google_tts":
+                self._google_tts(text, output_path, voice, model, api_key)
+            else:
+                raise ValueError(f"Unsupported TTS provider: {provider}")
+
+        if cached_path is not None:
+            _store_in_tts_cache(output_path, cached_path)
+        return output_path
+
+    def synthesize_speech_parallel(
+        self,
+        text: str,
+        output_path: Path,
+        voice: Optional[str] = None,
+        model: Optional[str] = None,
+        chunk_chars: int = TTS_CHUNK_CHARS,
+    ) -> Path:
+        """
+        Same as synthesize_speech, but long text is split at sentence
+        boundaries and the chunks are synthesized concurrently, then joined
+        into one MP3 with ffmpeg (stream copy, no re-encode).
+
+        Raises:
+            RuntimeError: if ffmpeg fails to join the chunks (includes its stderr)
+        """
+        chunks = _split_sentences(text, chunk_chars)
+        if len(chunks) <= 1 or config.tts_provider not in _CHUNKABLE_PROVIDERS:
+            return self.synthesize_speech(text, output_path, voice=voice, model=model)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        part_paths = [
+            output_path.with_name(f"{output_path.stem}.part{i}.mp3") for i in range(len(chunks))
+        ]
+        try:
+            with ThreadPoolExecutor(max_workers=TTS_CONCURRENCY) as pool:
+                list(pool.map(
+                    lambda chunk, path: self.synthesize_speech(chunk, path, voice=voice, model=model),
+                    chunks,
+                    part_paths,
+                ))
+
+            # The list goes in on stdin; absolute paths, since a piped list has no directory
+            concat_list = "".join(f"file '{path.resolve().as_posix()}'\n" for path in part_paths)
+            result = subprocess.run(
+                [
+                    executable("ffmpeg"), "-y", "-f", "concat", "-safe", "0",
+                    "-protocol_whitelist", "file,pipe", "-i", "pipe:0",
+                    "-c", "copy", str(output_path),
+                ],
+                input=concat_list.encode("utf-8"),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                **SPAWN_KWARGS,
+            )
+            if result.returncode != 0:
+                stderr = result.stderr.decode("utf-8", errors="replace").strip()
+                raise RuntimeError(f"ffmpeg failed to join TTS chunks: {stderr[-2000:]}")
+        finally:
+            for path in part_paths:
+                path.unlink(missing_ok=True)
+
+        return output_path
 
     def _openai_tts(
         self,
@@ -66,9 +306,7 @@ class TTSClient:
         api_key: str,
     ) -> Path:
         """OpenAI TTS synthesis"""
-        from openai import OpenAI
-
-        client = OpenAI(api_key=api_key)
+        client = _openai_client(api_key)
 
         # Create temporary file first
         temp_path = output_path.with_suffix(".tmp.mp3")
@@ -95,15 +333,7 @@ class TTSClient:
         api_key: str,
     ) -> Path:
         """ElevenLabs TTS synthesis"""
-        try:
-            from elevenlabs import VoiceSettings
-            from elevenlabs.client import ElevenLabs
-        except ImportError:
-            raise ImportError(
-                "elevenlabs package not installed. Install with: pip install elevenlabs"
-            )
-
-        client = ElevenLabs(api_key=api_key)
+        client = _elevenlabs_client(api_key)
 
         # Generate audio
         audio_generator = client.generate(
@@ -132,49 +362,14 @@ class TTSClient:
         api_key: str,
     ) -> Path:
         """Google Cloud TTS synthesis"""
-        try:
-            from google.cloud import texttospeech
-            import google.auth.credentials
-        except ImportError:
-            raise ImportError(
-                "google-cloud-texttospeech package not installed. "
-                "Install with: pip install google-cloud-texttospeech"
-            )
-
-        # Create credentials from API key
-        # Note: Google Cloud typically uses service account JSON files,
-        # but we're using an API key for simplicity
-        # For production, consider using service account authentication
-
-        # Set environment variable for authentication
-        import os
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = api_key
-
-        client = texttospeech.TextToSpeechClient()
+        client = _google_tts_client(api_key)
+        from google.cloud import texttospeech
 
         # Set the text input to be synthesized
         synthesis_input = texttospeech.SynthesisInput(text=text)
 
-        # Determine audio encoding based on model quality
-        if model == "neural2":
-            audio_encoding = texttospeech.AudioEncoding.MP3
-        elif model == "wavenet":
-            audio_encoding = texttospeech.AudioEncoding.MP3
-        else:  # standard
-            audio_encoding = texttospeech.AudioEncoding.MP3
-
-        # Build the voice request
-        voice_params = texttospeech.VoiceSelectionParams(
-            language_code=voice.split("-")[0] + "-" + voice.split("-")[1],  # e.g., "en-US"
-            name=voice,
-        )
-
-        # Select the audio config
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=audio_encoding,
-            speaking_rate=1.0,
-            pitch=0.0,
-        )
+        # The model is implied by the voice name (e.g. "en-US-Neural2-A")
+        voice_params, audio_config = _google_tts_params(voice)
 
         # Perform the text-to-speech request
         response = client.synthesize_speech(
@@ -193,59 +388,70 @@ class TTSClient:
 
         return output_path
 
+    def _check_provider(self, provider: str, api_key: str) -> None:
+        """Free authenticated call on the provider's (cached) client; raises on failure"""
+        if provider == "openai":
+            _openai_client(api_key).models.list()
+        elif provider == "elevenlabs":
+            _elevenlabs_client(api_key).voices.get_all()
+        elif provider == "google_tts":
+            _google_tts_client(api_key).list_voices()
+        else:
+            raise ValueError(f"Unsupported TTS provider: {provider}")
+
     def test_connection(self) -> dict:
         """
-        Test the current TTS configuration by synthesizing a short phrase
+        Test the current TTS configuration with a no-cost authenticated call
+        (listing models or voices); nothing is synthesized or billed
 
         Returns:
             Dict with success status and message
         """
-        try:
-            import tempfile
-
-            # Create a temporary file
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-                temp_path = Path(tmp.name)
+        provider = config.tts_provider
+        api_key = config.tts_api_key
+        result = {
+            "provider": provider,
+            "model": config.tts_model,
+            "voice": config.tts_voice,
+        }
 
-            # Synthesize a test phrase
-            test_text = "Hello, this is a test of the text to speech system."
+        try:
+            if not api_key:
+                raise RuntimeError(f"No API key configured for TTS provider: {provider}")
 
-            result_path = self.synthesize_speech(
-                text=test_text,
-                output_path=temp_path,
-            )
+            check_key = (provider, api_key)
+            checked_at = _connection_checks.get(check_key)
+            if checked_at is None or time.monotonic() - checked_at > TTS_CHECK_TTL_SECONDS:
+                self._check_provider(provider, api_key)
+                _connection_checks[check_key] = time.monotonic()
 
-            # Check if file was created and has content
-            if result_path.exists() and result_path.stat().st_size > 0:
-                # Clean up test file
-                result_path.unlink()
-
-                return {
-                    "success": True,
-                    "message": f"Successfully connected to {config.tts_provider} "
-                              f"({config.tts_model}, {config.tts_voice})",
-                    "provider": config.tts_provider,
-                    "model": config.tts_model,
-                    "voice": config.tts_voice,
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": "TTS generated empty audio file",
-                    "provider": config.tts_provider,
-                    "model": config.tts_model,
-                    "voice": config.tts_voice,
-                }
+            return {
+                "success": True,
+                "message": f"Successfully connected to {provider} "
+                          f"({config.tts_model}, {config.tts_voice})",
+                **result,
+            }
 
         except Exception as e:
             return {
                 "success": False,
                 "message": f"Failed to connect: {str(e)}",
-                "provider": config.tts_provider,
-                "model": config.tts_model,
-                "voice": config.tts_voice,
+                **result,
             }
 
+    def warm_up(self) -> None:
+        """
+        Build the configured provider's client and open its connection so the
+        first synthesis doesn't pay for the TLS handshake
+        """
+        if not config.tts_api_key:
+            return
+
+        result = self.test_connection()
+        if not result["success"]:
+            # Best effort: the first synthesis will retry and surface the real error
+            print(f"⚠️ TTS warm-up failed: {result['message']}")
+
 
 # Singleton instance
 tts_client = TTSClient()
\ No newline at end of file
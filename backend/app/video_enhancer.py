@@ -4,49 +4,154 @@ Adds code overlays, shrinks avatar to corner, creates professional layouts
 
 This is a SEPARATE module - can be enabled/disabled via API parameter
 """
+import hashlib
 import os
+import shutil
 import subprocess
 import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import requests
+import orjson
 from PIL import Image, ImageDraw, ImageFont
 
+from .subprocess_utils import SPAWN_KWARGS, executable
+
 
 class VideoEnhancerError(Exception):
     """Custom exception for video enhancement errors"""
     pass
 
 
+class UnseekableInputError(VideoEnhancerError):
+    """FFmpeg needed to seek a piped input (e.g. an MP4 with its index at the end)"""
+    pass
+
+
+# (connect, read) timeouts for video downloads, so a stalled server fails
+# instead of blocking forever
+DOWNLOAD_TIMEOUT = (10, 60)
+
+# FFmpeg stderr lines that mean a piped input had to be seekable
+_UNSEEKABLE_INPUT_MARKERS = ("moov atom not found", "partial file", "error reading header")
+
+
 def check_ffmpeg_installed() -> bool:
     """Check if FFmpeg is installed on the system"""
     try:
         result = subprocess.run(
-            ['ffmpeg', '-version'],
+            [executable('ffmpeg'), '-version'],
             capture_output=True,
             text=True,
-            timeout=5
+            timeout=5,
+            **SPAWN_KWARGS
         )
         return result.returncode == 0
     except (subprocess.SubprocessError, FileNotFoundError):
         return False
 
 
+# H.264 encoders in order of preference, with flags for roughly the
+# quality of libx264 at CRF 23
+H264_ENCODER_ARGS = {
+    'h264_nvenc': ['-c:v', 'h264_nvenc', '-preset', 'p4', '-cq', '23'],  # NVIDIA
+    'h264_videotoolbox': ['-c:v', 'h264_videotoolbox', '-b:v', '4M'],  # macOS
+    'h264_qsv': ['-c:v', 'h264_qsv', '-global_quality', '23'],  # Intel
+    'libx264': ['-c:v', 'libx264', '-preset', 'medium', '-crf', '23'],  # software
+}
+
+
+def _encoder_works(encoder: str) -> bool:
+    """Encode a few blank frames; a build can list an encoder without the GPU behind it"""
+    try:
+        result = subprocess.run(
+            [
+                executable('ffmpeg'), '-hide_banner', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.2',
+                *H264_ENCODER_ARGS[encoder],
+                '-f', 'null', '-',
+            ],
+            capture_output=True,
+            text=True,
+            timeout=15,
+            **SPAWN_KWARGS
+        )
+        return result.returncode == 0
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def pick_h264_encoder() -> str:
+    """Fastest working H.264 encoder on this machine, probed once per process"""
+    try:
+        listed = subprocess.run(
+            [executable('ffmpeg'), '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            **SPAWN_KWARGS
+        ).stdout
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return 'libx264'
+
+    for encoder in H264_ENCODER_ARGS:
+        if encoder == 'libx264':
+            break
+        if encoder in listed and _encoder_works(encoder):
+            print(f"⚡ Using hardware encoder: {encoder}")
+            return encoder
+    return 'libx264'
+
+
 def download_video(video_url: str, output_path: str) -> str:
     """Download video from HeyGen to local file"""
     print(f"📥 Downloading video from: {video_url}")
 
-    response = requests.get(video_url, stream=True)
-    response.raise_for_status()
-
-    with open(output_path, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+    with requests.get(video_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        # Undo any Content-Encoding, as iter_content would, then copy in
+        # 1 MiB blocks rather than 8 KiB chunks
+        response.raw.decode_content = True
+        with open(output_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=1 << 20)
 
     print(f"✅ Video downloaded to: {output_path}")
     return output_path
 
 
+# Monospace fonts to try, in order
+CODE_FONT_PATHS = [
+    '/System/Library/Fonts/Courier.dfont',  # macOS
+    '/System/Library/Fonts/Monaco.dfont',   # macOS
+    '/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf',  # Linux
+    'C:\\Windows\\Fonts\\consola.ttf',  # Windows
+]
+
+# Extra pixels between code lines
+CODE_LINE_SPACING = 8
+
+# Rendered code images, keyed by content and size so snippets shared across
+# lessons or retried renders skip PIL entirely
+CODE_IMAGE_CACHE_DIR = Path(tempfile.gettempdir()) / "b2c_code_imgs"
+
+
+@lru_cache(maxsize=8)
+def _code_font(font_size: int):
+    """Load the monospace font once per size; FreeType setup is not free"""
+    for font_path in CODE_FONT_PATHS:
+        if os.path.exists(font_path):
+            try:
+                return ImageFont.truetype(font_path, font_size)
+            except:
+                continue
+
+    # Fallback to default font
+    return ImageFont.load_default()
+
+
 def create_code_image(
     code_text: str,
     width: int = 900,
@@ -56,108 +161,74 @@ def create_code_image(
     """
     Create an image with code (monospace font, dark theme)
 
-    Returns: Path to generated image
+    Returns: Path to generated image (shared cache file, do not delete)
     """
+    key = hashlib.sha256(
+        f"{code_text}|{width}|{height}|{font_size}".encode("utf-8")
+    ).hexdigest()
+    cached_path = CODE_IMAGE_CACHE_DIR / f"{key}.png"
+    if cached_path.exists():
+        return str(cached_path)
+
     # Create image with dark background
     img = Image.new('RGB', (width, height), color='#282c34')
     draw = ImageDraw.Draw(img)
+    font = _code_font(font_size)
 
-    # Try to use a monospace font
-    font_paths = [
-        '/System/Library/Fonts/Courier.dfont',  # macOS
-        '/System/Library/Fonts/Monaco.dfont',   # macOS
-        '/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf',  # Linux
-        'C:\\Windows\\Fonts\\consola.ttf',  # Windows
-    ]
-
-    font = None
-    for font_path in font_paths:
-        if os.path.exists(font_path):
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                break
-            except:
-                continue
-
-    if font is None:
-        # Fallback to default font
-        font = ImageFont.load_default()
-
-    # Draw code text with line numbers
+    # Fit as many lines as the image holds, with "..." if code is too long
     lines = code_text.split('\n')
-    y_offset = 20
-    line_height = font_size + 8
-
-    for i, line in enumerate(lines, 1):
-        # Line number (gray)
-        line_num = f"{i:2d} "
-        draw.text((20, y_offset), line_num, fill='#5c6370', font=font)
-
-        # Code text (light)
-        draw.text((60, y_offset), line, fill='#abb2bf', font=font)
-
-        y_offset += line_height
-
-        if y_offset > height - 40:
-            # Add "..." if code is too long
-            draw.text((60, y_offset), "...", fill='#abb2bf', font=font)
-            break
+    line_height = font_size + CODE_LINE_SPACING
+    max_lines = max(1, (height - 60) // line_height + 1)
+    visible = lines[:max_lines]
+    if len(lines) > max_lines:
+        visible.append("...")
+
+    # Two multiline renders (gray line numbers, light code) instead of two
+    # draw.text calls per line
+    line_numbers = "\n".join(f"{i:2d} " for i in range(1, min(len(lines), max_lines) + 1))
+    draw.multiline_text(
+        (20, 20), line_numbers, fill='#5c6370', font=font, spacing=CODE_LINE_SPACING
+    )
+    draw.multiline_text(
+        (60, 20), "\n".join(visible), fill='#abb2bf', font=font, spacing=CODE_LINE_SPACING
+    )
 
-    # Save to temp file
+    # Write under a temp name so concurrent renders never see a partial PNG
+    CODE_IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
     temp_file = tempfile.NamedTemporaryFile(
         suffix='.png',
         delete=False,
-        dir=tempfile.gettempdir()
+        dir=CODE_IMAGE_CACHE_DIR
     )
+    temp_file.close()
     img.save(temp_file.name)
+    os.replace(temp_file.name, cached_path)
 
-    print(f"🖼️  Code image created: {temp_file.name}")
-    return temp_file.name
+    print(f"🖼️  Code image created: {cached_path}")
+    return str(cached_path)
 
 
-def enhance_video_with_code(
-    video_path: str,
+def _build_enhance_command(
+    video_input: str,
     code_snippets: List[Dict[str, Any]],
-    layout: str = "avatar-right",
-    output_path: Optional[str] = None
-) -> str:
-    """
-    Enhance video by shrinking avatar and adding code overlays
-
-    Args:
-        video_path: Path to original HeyGen video
-        code_snippets: List of dicts with 'timestamp', 'duration', 'code'
-        layout: 'avatar-right', 'avatar-left', 'avatar-corner'
-        output_path: Where to save enhanced video
-
-    Returns:
-        Path to enhanced video
-    """
-    if not check_ffmpeg_installed():
-        raise VideoEnhancerError(
-            "FFmpeg is not installed. Install with: brew install ffmpeg (macOS) "
-            "or apt install ffmpeg (Linux)"
-        )
-
-    if not code_snippets:
-        print("⚠️  No code snippets provided, returning original video")
-        return video_path
-
-    if output_path is None:
-        output_path = video_path.replace('.mp4', '_enhanced.mp4')
-
-    print(f"\n🎨 Enhancing video with {len(code_snippets)} code overlays...")
-    print(f"   Layout: {layout}")
-
-    # Create code images
-    code_images = []
+    layout: str,
+    output_path: str
+) -> List[str]:
+    """FFmpeg command overlaying the snippets on `video_input` (a path or 'pipe:0')"""
+    # Create one code image (shared cache file, kept after encoding) per
+    # distinct snippet; repeats just add another time window to its overlay
+    images_by_code: Dict[str, Dict[str, Any]] = {}
     for i, snippet in enumerate(code_snippets):
-        img_path = create_code_image(snippet['code'])
-        code_images.append({
-            'path': img_path,
-            'timestamp': snippet.get('timestamp', i * 10),
-            'duration': snippet.get('duration', 8)
-        })
+        code_img = images_by_code.get(snippet['code'])
+        if code_img is None:
+            code_img = images_by_code[snippet['code']] = {
+                'path': create_code_image(snippet['code']),
+                'windows': [],
+            }
+        code_img['windows'].append(
+            (snippet.get('timestamp', i * 10), snippet.get('duration', 8))
+        )
+    code_images = list(images_by_code.values())
 
     # Build FFmpeg filter_complex
     # Step 1: Scale avatar to corner/side
@@ -189,14 +260,15 @@ def enhance_video_with_code(
 
     # Add each code overlay
     for i, code_img in enumerate(code_images):
-        timestamp = code_img['timestamp']
-        duration = code_img['duration']
-        end_time = timestamp + duration
+        enable = "+".join(
+            f"between(t,{timestamp},{timestamp + duration})"
+            for timestamp, duration in code_img['windows']
+        )
 
         # Add this code image as an input
         filter_parts.append(
             f"[{current_video}][{i+1}:v]overlay={code_x}:{code_y}:"
-            f"enable='between(t,{timestamp},{end_time})'[v{i}]"
+            f"enable='{enable}'[v{i}]"
         )
         current_video = f"v{i}"
 
@@ -209,9 +281,9 @@ def enhance_video_with_code(
 
     # Build FFmpeg command
     ffmpeg_cmd = [
-        'ffmpeg',
+        executable('ffmpeg'),
         '-y',  # Overwrite output
-        '-i', video_path,  # Input 0: avatar video
+        '-i', video_input,  # Input 0: avatar video
     ]
 
     # Add code images as inputs
@@ -223,12 +295,49 @@ def enhance_video_with_code(
         '-map', '[final]',
         '-map', '0:a',  # Copy audio from original
         '-c:a', 'copy',
-        '-c:v', 'libx264',
-        '-preset', 'medium',
-        '-crf', '23',
+        *H264_ENCODER_ARGS[pick_h264_encoder()],
         output_path
     ])
 
+    return ffmpeg_cmd
+
+
+def enhance_video_with_code(
+    video_path: str,
+    code_snippets: List[Dict[str, Any]],
+    layout: str = "avatar-right",
+    output_path: Optional[str] = None
+) -> str:
+    """
+    Enhance video by shrinking avatar and adding code overlays
+
+    Args:
+        video_path: Path to original HeyGen video
+        code_snippets: List of dicts with 'timestamp', 'duration', 'code'
+        layout: 'avatar-right', 'avatar-left', 'avatar-corner'
+        output_path: Where to save enhanced video
+
+    Returns:
+        Path to enhanced video
+    """
+    if not check_ffmpeg_installed():
+        raise VideoEnhancerError(
+            "FFmpeg is not installed. Install with: brew install ffmpeg (macOS) "
+            "or apt install ffmpeg (Linux)"
+        )
+
+    if not code_snippets:
+        print("⚠️  No code snippets provided, returning original video")
+        return video_path
+
+    if output_path is None:
+        output_path = video_path.replace('.mp4', '_enhanced.mp4')
+
+    print(f"\n🎨 Enhancing video with {len(code_snippets)} code overlays...")
+    print(f"   Layout: {layout}")
+
+    ffmpeg_cmd = _build_enhance_command(video_path, code_snippets, layout, output_path)
+
     print(f"\n🎬 Running FFmpeg...")
     print(f"   Command: {' '.join(ffmpeg_cmd[:10])}...")
 
@@ -237,7 +346,8 @@ def enhance_video_with_code(
             ffmpeg_cmd,
             capture_output=True,
             text=True,
-            timeout=300  # 5 minutes timeout
+            timeout=300,  # 5 minutes timeout
+            **SPAWN_KWARGS
         )
 
         if result.returncode != 0:
@@ -246,14 +356,6 @@ def enhance_video_with_code(
             )
 
         print(f"✅ Enhanced video created: {output_path}")
-
-        # Cleanup temp code images
-        for code_img in code_images:
-            try:
-                os.unlink(code_img['path'])
-            except:
-                pass
-
         return output_path
 
     except subprocess.TimeoutExpired:
@@ -262,6 +364,113 @@ def enhance_video_with_code(
         raise VideoEnhancerError(f"FFmpeg error: {e}")
 
 
+def enhance_video_from_stream(
+    video_url: str,
+    code_snippets: List[Dict[str, Any]],
+    layout: str = "avatar-right",
+    output_path: str = "enhanced.mp4"
+) -> str:
+    """
+    Enhance a remote video in one pass, piping the download into FFmpeg
+    instead of writing it to disk first
+
+    FFmpeg cannot seek a pipe, so an MP4 with its index at the end fails
+    here with UnseekableInputError; enhance_video_from_url then falls back
+    to downloading the file. Timeouts and download errors raise
+    VideoEnhancerError.
+
+    Returns:
+        Path to enhanced video
+    """
+    if not check_ffmpeg_installed():
+        raise VideoEnhancerError(
+            "FFmpeg is not installed. Install with: brew install ffmpeg (macOS) "
+            "or apt install ffmpeg (Linux)"
+        )
+
+    print(f"\n🎨 Streaming {video_url} into FFmpeg with {len(code_snippets)} code overlays...")
+    print(f"   Layout: {layout}")
+
+    ffmpeg_cmd = _build_enhance_command('pipe:0', code_snippets, layout, output_path)
+
+    download_errors: List[BaseException] = []
+    stop_feeding = threading.Event()
+
+    # Both are closed even if the request fails or FFmpeg can't be spawned.
+    # stderr goes to a file: the pipe would need draining while we feed stdin
+    with requests.get(video_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response, \
+            tempfile.TemporaryFile() as stderr_file:
+        response.raise_for_status()
+        try:
+            proc = subprocess.Popen(
+                ffmpeg_cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
+                **SPAWN_KWARGS
+            )
+        except OSError as e:
+            raise VideoEnhancerError(f"FFmpeg error: {e}")
+
+        def feed_ffmpeg() -> None:
+            try:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    proc.stdin.write(chunk)
+            except (requests.RequestException, AttributeError, ValueError) as e:
+                # Download failed or stalled; errors after we closed the response don't count
+                if not stop_feeding.is_set():
+                    download_errors.append(e)
+            except OSError:
+                pass  # FFmpeg exited early; its stderr says why
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+
+        feeder = threading.Thread(target=feed_ffmpeg, daemon=True)
+        feeder.start()
+
+        try:
+            returncode = proc.wait(timeout=300)  # 5 minutes timeout
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise VideoEnhancerError("FFmpeg processing timeout (>5 minutes)")
+        finally:
+            # Closing the response unblocks a feeder stuck in iter_content;
+            # one blocked in a read still gives up after the read timeout
+            stop_feeding.set()
+            response.close()
+            feeder.join(timeout=DOWNLOAD_TIMEOUT[1])
+
+        if download_errors:
+            raise VideoEnhancerError(f"Video download failed: {download_errors[0]}")
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', errors='replace')
+            if any(marker in stderr for marker in _UNSEEKABLE_INPUT_MARKERS):
+                raise UnseekableInputError(f"FFmpeg failed: {stderr[-500:]}")
+            raise VideoEnhancerError(f"FFmpeg failed: {stderr[-500:]}")  # Last 500 chars
+
+    print(f"✅ Enhanced video created: {output_path}")
+    return output_path
+
+
+def _enhancement_key(
+    video_url: str,
+    code_snippets: List[Dict[str, Any]],
+    layout: str
+) -> str:
+    """Fingerprint of everything that determines the enhanced video"""
+    payload = orjson.dumps(
+        [video_url, code_snippets, layout],
+        option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
 def enhance_video_from_url(
     video_url: str,
     code_snippets: List[Dict[str, Any]],
@@ -287,12 +496,36 @@ def enhance_video_from_url(
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
+    enhanced_path = output_dir / "enhanced.mp4"
+
+    # Skip FFmpeg entirely when this exact enhancement is already on disk
+    key_path = enhanced_path.with_suffix(".key")
+    key = _enhancement_key(video_url, code_snippets, layout)
+    if code_snippets and enhanced_path.exists() and key_path.exists():
+        if key_path.read_text() == key:
+            print(f"♻️  Reusing enhanced video: {enhanced_path}")
+            return str(enhanced_path)
+    key_path.unlink(missing_ok=True)
+
+    # Overlap download and encoding when the video can be read from a pipe
+    if code_snippets:
+        try:
+            result = enhance_video_from_stream(
+                video_url,
+                code_snippets,
+                layout=layout,
+                output_path=str(enhanced_path)
+            )
+            key_path.write_text(key)
+            return result
+        except UnseekableInputError as e:
+            print(f"⚠️  Video can't be streamed into FFmpeg, downloading first: {e}")
+
     # Download original video
     original_path = output_dir / "original.mp4"
     download_video(video_url, str(original_path))
 
     # Enhance it
-    enhanced_path = output_dir / "enhanced.mp4"
     result = enhance_video_with_code(
         str(original_path),
         code_snippets,
@@ -300,6 +533,8 @@ def enhance_video_from_url(
         output_path=str(enhanced_path)
     )
 
+    if code_snippets:
+        key_path.write_text(key)
     return result
 
 
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
-import json
 import math
+import os
 import re
 import shutil
 import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
-from openai import OpenAI  # type: ignore[import]
+import orjson
 from pydantic import BaseModel
 
 from .lesson_content import LessonContent, load_lesson_content
 from .pdf_utils import load_book_text, load_book_images
 from .llm_client import llm_client
+from .subprocess_utils import SPAWN_KWARGS, executable
 from .tts_client import tts_client
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "books"
@@ -22,6 +26,25 @@ VIDEO_DIR = REPO_ROOT / "video"
 PUBLIC_ASSETS_DIR = VIDEO_DIR / "public"
 GENERATED_ASSETS_DIR = PUBLIC_ASSETS_DIR / "generated"
 
+# Slides narrated at once; their chunk requests share tts_client's
+# process-wide cap of TTS_CONCURRENCY provider calls
+SLIDE_TTS_CONCURRENCY = 6
+
+
+# Text patterns used while building plans, compiled once
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_SENTENCE_END_RE = re.compile(r"[.!?]")
+_SLIDE_IMAGE_RE = re.compile(r"(\d+)\s*[:\-]\s*(img_\d+)", re.IGNORECASE)
+# One alternation instead of a search per indicator
+_CODE_INDICATOR_RE = re.compile(
+    "|".join([
+        r'\bcode\b', r'\bfunction\b', r'\bimplementation\b', r'\bexample\b',
+        r'\bdef\s+\w+', r'\bclass\s+\w+', r'\bimport\b', r'\breturn\b',
+        r'\blet\s+\w+', r'\bconst\s+\w+', r'\bvar\s+\w+',
+        r'```', r'\bsnippet\b', r'\bwrite\b.*\bcode\b',
+    ])
+)
+
 
 class Slide(BaseModel):
     title: str
@@ -55,12 +78,12 @@ def synthesize_tts(text: str, out_path: Path) -> None:
     temp_mp3 = out_path.with_suffix(".tmp.mp3")
 
     # Use configurable TTS client
-    tts_client.synthesize_speech(text=text, output_path=temp_mp3)
+    tts_client.synthesize_speech_parallel(text=text, output_path=temp_mp3)
 
     # Convert to WAV format for consistent audio processing
     subprocess.run(
         [
-            "ffmpeg",
+            executable("ffmpeg"),
             "-y",
             "-i",
             str(temp_mp3),
@@ -71,6 +94,7 @@ def synthesize_tts(text: str, out_path: Path) -> None:
             str(out_path),
         ],
         check=True,
+        **SPAWN_KWARGS,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
     )
@@ -80,13 +104,29 @@ def synthesize_tts(text: str, out_path: Path) -> None:
         temp_mp3.unlink()
 
 
+# Parsed lesson files, keyed by (path, mtime_ns, size) so an edited or
+# regenerated file is re-read. Callers must not mutate the returned objects.
+@lru_cache(maxsize=256)
+def _read_json_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+@lru_cache(maxsize=256)
+def _read_text_cached(path_str: str, mtime_ns: int, size: int) -> str:
+    return Path(path_str).read_text(encoding="utf-8")
+
+
+def _read_json(path: Path) -> Any:
+    """Raises FileNotFoundError if path is missing"""
+    st = path.stat()
+    return _read_json_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
 def _load_outline(book_id: str) -> Optional[dict]:
     outline_path = DATA_DIR / f"{book_id}_outline.json"
-    if not outline_path.exists():
-        return None
     try:
-        return json.loads(outline_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+        return _read_json(outline_path)
+    except (FileNotFoundError, orjson.JSONDecodeError):
         return None
 
 
@@ -96,8 +136,11 @@ def _load_script(book_id: str, lesson_id: str) -> Optional[str]:
         DATA_DIR / book_id / f"{book_id}_{lesson_id}_script.txt",
     ]
     for script_path in candidates:
-        if script_path.exists():
-            return script_path.read_text(encoding="utf-8")
+        try:
+            st = script_path.stat()
+        except FileNotFoundError:
+            continue
+        return _read_text_cached(str(script_path), st.st_mtime_ns, st.st_size)
     return None
 
 
@@ -111,7 +154,7 @@ def _auto_generate_script(
     from .script_generator import generate_lesson_script
 
     try:
-        book_text = load_book_text(book_id)
+        book_text = load_book_text(book_id, head_only=True)
     except FileNotFoundError:
         book_text = ""
 
@@ -144,28 +187,26 @@ def _load_quiz(book_id: str, lesson_id: str) -> Optional[List[dict]]:
         DATA_DIR / book_id / f"{book_id}_{lesson_id}_quiz.json",
     ]
     for quiz_path in candidates:
-        if quiz_path.exists():
-            try:
-                return json.loads(quiz_path.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                continue
+        try:
+            return _read_json(quiz_path)
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            continue
     return None
 
 
+def _even_bounds(total: int, parts: int) -> List[int]:
+    """parts + 1 integer cut points splitting range(total) into near-equal runs"""
+    return [i * total // parts for i in range(parts + 1)]
+
+
 def _split_text_evenly(text: str, parts: int) -> List[str]:
     if parts <= 0:
         return []
     words = text.split()
     if not words:
         return ["" for _ in range(parts)]
-    total_words = len(words)
-    segments: List[str] = []
-    for i in range(parts):
-        start = int(round(i * total_words / parts))
-        end = int(round((i + 1) * total_words / parts))
-        segment = " ".join(words[start:end]).strip()
-        segments.append(segment)
-    return segments
+    bounds = _even_bounds(len(words), parts)
+    return [" ".join(words[start:end]) for start, end in zip(bounds, bounds[1:])]
 
 
 def _default_slide_narration(slide: Slide) -> str:
@@ -177,42 +218,54 @@ def _default_slide_narration(slide: Slide) -> str:
     return " ".join(lines).strip()
 
 
+# Demo code shown on slides for lessons about RAG or prompting
+_RAG_SNIPPET = (
+    "# Simple RAG query flow\n"
+    "from typing import List\n"
+    "import numpy as np\n"
+    "\n"
+    "def embed(text: str) -> np.ndarray:\n"
+    "    ...  # call your embedding model\n"
+    "\n"
+    "def top_k(query: str, vectors: List[np.ndarray], chunks: List[str], k=5):\n"
+    "    q = embed(query)\n"
+    "    sims = [float(np.dot(q, v) / (np.linalg.norm(q)*np.linalg.norm(v))) for v in vectors]\n"
+    "    idx = np.argsort(sims)[::-1][:k]\n"
+    "    return [(chunks[i], sims[i]) for i in idx]\n"
+    "\n"
+    "chunks = [\"... doc chunk ...\"]\n"
+    "vectors = [embed(c) for c in chunks]\n"
+    "hits = top_k(\"How do I chunk docs?\", vectors, chunks)\n"
+)
+
+_PROMPT_SNIPPET = (
+    "# Grounded prompt assembly\n"
+    "def build_prompt(question: str, contexts: list[str]) -> str:\n"
+    "    formatted = \"\\n\".join(f\"[doc{i}] {c}\" for i, c in enumerate(contexts, 1))\n"
+    "    return (\n"
+    "        \"You are a grounded assistant. Use only the provided docs.\\n\\n\"\n"
+    "        f\"Question: {question}\\n\\n\"\n"
+    "        f\"Context:\\n{formatted}\\n\\n\"\n"
+    "        \"If unsure, say you don't know. Cite doc ids.\"\n"
+    "    )\n"
+    "\n"
+    "prompt = build_prompt(\"Explain chunk overlap\", [\"chunking with 20-30% overlap helps continuity\"])\n"
+)
+
+
+def _lowercase_lesson_terms(lesson: dict) -> Tuple[str, List[str]]:
+    """(lowercased title, lowercased key points), for keyword checks"""
+    title = (lesson.get("title") or "").lower()
+    key_points = [kp.lower() for kp in lesson.get("key_points") or []]
+    return title, key_points
+
+
 def _code_snippet_from_lesson(lesson: dict) -> Optional[str]:
-    title = lesson.get("title", "").lower()
-    key_points = lesson.get("key_points") or []
-    if "rag" in title or any("retriev" in kp.lower() for kp in key_points):
-        return (
-            "# Simple RAG query flow\n"
-            "from typing import List\n"
-            "import numpy as np\n"
-            "\n"
-            "def embed(text: str) -> np.ndarray:\n"
-            "    ...  # call your embedding model\n"
-            "\n"
-            "def top_k(query: str, vectors: List[np.ndarray], chunks: List[str], k=5):\n"
-            "    q = embed(query)\n"
-            "    sims = [float(np.dot(q, v) / (np.linalg.norm(q)*np.linalg.norm(v))) for v in vectors]\n"
-            "    idx = np.argsort(sims)[::-1][:k]\n"
-            "    return [(chunks[i], sims[i]) for i in idx]\n"
-            "\n"
-            "chunks = [\"... doc chunk ...\"]\n"
-            "vectors = [embed(c) for c in chunks]\n"
-            "hits = top_k(\"How do I chunk docs?\", vectors, chunks)\n"
-        )
-    if "prompt" in title or any("prompt" in kp.lower() for kp in key_points):
-        return (
-            "# Grounded prompt assembly\n"
-            "def build_prompt(question: str, contexts: list[str]) -> str:\n"
-            "    formatted = \"\\n\".join(f\"[doc{i}] {c}\" for i, c in enumerate(contexts, 1))\n"
-            "    return (\n"
-            "        \"You are a grounded assistant. Use only the provided docs.\\n\\n\"\n"
-            "        f\"Question: {question}\\n\\n\"\n"
-            "        f\"Context:\\n{formatted}\\n\\n\"\n"
-            "        \"If unsure, say you don't know. Cite doc ids.\"\n"
-            "    )\n"
-            "\n"
-            "prompt = build_prompt(\"Explain chunk overlap\", [\"chunking with 20-30% overlap helps continuity\"])\n"
-        )
+    title, key_points = _lowercase_lesson_terms(lesson)
+    if "rag" in title or any("retriev" in kp for kp in key_points):
+        return _RAG_SNIPPET
+    if "prompt" in title or any("prompt" in kp for kp in key_points):
+        return _PROMPT_SNIPPET
     return None
 
 
@@ -230,14 +283,15 @@ def _apply_narrations(
     if not slides:
         return
 
-    # Check if slides already have meaningful narrations
-    slides_with_narration = sum(1 for s in slides if s.narration.strip())
+    # Check if slides already have meaningful narrations (isspace doesn't
+    # copy the string the way strip does)
+    has_narration = [bool(s.narration) and not s.narration.isspace() for s in slides]
     
     # If most slides already have narration, don't overwrite them
-    if slides_with_narration >= len(slides) * 0.5:
+    if sum(has_narration) >= len(slides) * 0.5:
         # Just fill in any missing ones with defaults
-        for slide in slides:
-            if not slide.narration.strip():
+        for slide, narrated in zip(slides, has_narration):
+            if not narrated:
                 slide.narration = _default_slide_narration(slide)
         return
 
@@ -248,7 +302,7 @@ def _apply_narrations(
 
     for idx, slide in enumerate(slides):
         # Skip slides that already have narration
-        if slide.narration.strip():
+        if has_narration[idx]:
             continue
             
         candidate = ""
@@ -265,7 +319,11 @@ def _apply_narrations(
                 )
             lines.append("Pay attention to how this connects to grounding and latency.")
             candidate = " ".join(lines)
-        slide.narration = candidate.strip() or _default_slide_narration(slide)
+        # Word-joined segments and the fallback above have no outer whitespace
+        slide.narration = (
+            candidate if candidate and not candidate.isspace()
+            else _default_slide_narration(slide)
+        )
 
 
 def _chunk(items: List[str], size: int) -> List[List[str]]:
@@ -321,21 +379,21 @@ def _build_plan_from_content(content: LessonContent) -> LessonVideoPlan:
 
 
 def _build_plan_from_lesson(
-    *, book_id: str, lesson_index: int, lesson: dict
+    *, book_id: str, lesson_index: int, lesson: dict, code_snippet: Optional[str]
 ) -> LessonVideoPlan:
     title = lesson.get("title") or f"Lesson {lesson_index + 1}"
     lesson_id = lesson.get("id") or f"lesson_{lesson_index + 1}"
     summary = lesson.get("summary", "")
     key_points = lesson.get("key_points") or []
-    code_snippet = _code_snippet_from_lesson(lesson)
     slides: List[Slide] = []
 
-    summary_bullets = [line.strip() for line in summary.split(".") if line.strip()]
+    # Only the first four summary sentences are ever shown
+    summary_bullets = [bullet for line in summary.split(".") if (bullet := line.strip())][:4]
     if summary_bullets:
         slides.append(
             Slide(
                 title=f"{title} Overview",
-                bullets=summary_bullets[:4],
+                bullets=summary_bullets,
                 narration="",
             )
         )
@@ -366,24 +424,23 @@ def _build_plan_from_lesson(
             )
 
     # Add summary bullets to each slide to enrich fallback content
-    summary_bullets_for_all = summary_bullets[:4]
-    if summary_bullets_for_all:
+    if summary_bullets:
         for s in slides:
             if len(s.bullets) < 4:
-                s.bullets.extend(
-                    [b for b in summary_bullets_for_all if b not in s.bullets]
-                )
+                existing = set(s.bullets)
+                s.bullets.extend([b for b in summary_bullets if b not in existing])
 
     # Add an implementation / code sketch slide to make content richer
     impl_bullets: List[str] = []
-    if "rag" in title.lower() or any("retriev" in kp.lower() for kp in key_points):
+    title_lc, key_points_lc = _lowercase_lesson_terms(lesson)
+    if "rag" in title_lc or any("retriev" in kp for kp in key_points_lc):
         impl_bullets = [
             "Chunk docs (200–400 tokens, 20–30% overlap)",
             "Embed and store vectors with metadata",
             "Top-k search with similarity threshold",
             "Trim to top context and ground the prompt",
         ]
-    elif any("prompt" in kp.lower() for kp in key_points):
+    elif any("prompt" in kp for kp in key_points_lc):
         impl_bullets = [
             "Keep system lean: ground in provided chunks",
             "User: question + cited context list",
@@ -505,7 +562,7 @@ def _fallback_extract_keywords(text: str) -> List[str]:
     ]
     
     # Split into sentences and extract key phrases
-    sentences = re.split(r'[.!?]', text)
+    sentences = _SENTENCE_END_RE.split(text)
     keywords: List[str] = []
     
     for sent in sentences[:6]:
@@ -543,14 +600,7 @@ def _fallback_extract_keywords(text: str) -> List[str]:
 
 def _should_show_code(chunk_text: str) -> bool:
     """Determine if this chunk should show a code example."""
-    code_indicators = [
-        r'\bcode\b', r'\bfunction\b', r'\bimplementation\b', r'\bexample\b',
-        r'\bdef\s+\w+', r'\bclass\s+\w+', r'\bimport\b', r'\breturn\b',
-        r'\blet\s+\w+', r'\bconst\s+\w+', r'\bvar\s+\w+',
-        r'```', r'\bsnippet\b', r'\bwrite\b.*\bcode\b',
-    ]
-    text_lower = chunk_text.lower()
-    return any(re.search(pattern, text_lower) for pattern in code_indicators)
+    return _CODE_INDICATOR_RE.search(chunk_text.lower()) is not None
 
 
 def _match_images_to_slides(
@@ -677,7 +727,7 @@ Match the most relevant image to each slide based on the image descriptions:"""
                 continue
             
             # Handle various formats: "0:img_5", "Slide 0: img_5", "0 - img_5"
-            match = re.search(r'(\d+)\s*[:\-]\s*(img_\d+)', line, re.IGNORECASE)
+            match = _SLIDE_IMAGE_RE.search(line)
             if not match:
                 continue
             
@@ -728,16 +778,15 @@ def _copy_matched_images_to_public(slides: List[Slide], book_id: str) -> None:
         relative_path = parts[1]  # "book_id/images/page_1_img_1.png"
         source_path = DATA_DIR / relative_path
         
-        if not source_path.exists():
+        # Copy to Remotion public folder
+        target_path = GENERATED_ASSETS_DIR / book_id / "images" / source_path.name
+        try:
+            _sync_file(source_path, target_path)
+        except FileNotFoundError:
             print(f"⚠️ Image not found: {source_path}")
             slide.imagePath = None
             continue
         
-        # Copy to Remotion public folder
-        target_path = GENERATED_ASSETS_DIR / book_id / "images" / source_path.name
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy(source_path, target_path)
-        
         # Update path to be relative to Remotion public folder
         slide.imagePath = f"/generated/{book_id}/images/{source_path.name}"
         print(f"📁 Copied image to Remotion: {slide.imagePath}")
@@ -756,7 +805,7 @@ def _build_plan_from_script(
     """
     sentences = [
         s.strip()
-        for s in re.split(r"(?<=[.!?])\s+", script_text)
+        for s in _SENTENCE_SPLIT_RE.split(script_text)
         if s.strip()
     ]
     if not sentences:
@@ -764,13 +813,10 @@ def _build_plan_from_script(
 
     # Target 4-6 slides for a good pace
     target_slides = min(6, max(4, len(sentences) // 4 or 4))
-    chunks: List[List[str]] = []
-    for i in range(target_slides):
-        start = int(round(i * len(sentences) / target_slides))
-        end = int(round((i + 1) * len(sentences) / target_slides))
-        chunk = sentences[start:end] or []
-        if chunk:
-            chunks.append(chunk)
+    bounds = _even_bounds(len(sentences), target_slides)
+    chunks: List[List[str]] = [
+        sentences[start:end] for start, end in zip(bounds, bounds[1:]) if end > start
+    ]
 
     slides: List[Slide] = []
     code_placed = False
@@ -821,7 +867,10 @@ def _build_plan_from_script(
     )
 
 
-def _build_plan(book_id: str, lesson_index: int) -> Tuple[LessonVideoPlan, Optional[dict]]:
+def _build_plan(
+    book_id: str, lesson_index: int
+) -> Tuple[LessonVideoPlan, Optional[dict], Optional[str]]:
+    """(plan, outline lesson, script text if it was loaded or generated here)"""
     outline = _load_outline(book_id)
     lessons = outline.get("lessons") if outline else None
     if lessons and 0 <= lesson_index < len(lessons):
@@ -832,7 +881,7 @@ def _build_plan(book_id: str, lesson_index: int) -> Tuple[LessonVideoPlan, Optio
         content = _load_content_if_available(book_id, lesson_id)
         if content:
             plan = _build_plan_from_content(content)
-            return plan, lesson
+            return plan, lesson, None
 
         # 2. Try existing script
         script_text = _load_script(book_id, lesson_id)
@@ -851,7 +900,7 @@ def _build_plan(book_id: str, lesson_index: int) -> Tuple[LessonVideoPlan, Optio
                 script_text=script_text,
                 code_snippet=code_snippet,
             )
-            return plan, lesson
+            return plan, lesson, script_text
 
         # 5. Fallback to outline-only (last resort)
         print(f"⚠️ Using outline-only fallback for {lesson_id}")
@@ -859,8 +908,9 @@ def _build_plan(book_id: str, lesson_index: int) -> Tuple[LessonVideoPlan, Optio
             book_id=book_id,
             lesson_index=lesson_index,
             lesson=lesson,
+            code_snippet=code_snippet,
         )
-        return plan, lesson
+        return plan, lesson, None
 
     # No outline available - use generic fallback
     fallback_plan = LessonVideoPlan(
@@ -882,13 +932,31 @@ def _build_plan(book_id: str, lesson_index: int) -> Tuple[LessonVideoPlan, Optio
             ),
         ],
     )
-    return fallback_plan, None
+    return fallback_plan, None, None
+
+
+def _sync_file(source: Path, target: Path) -> None:
+    """
+    Copy source to target (keeping mtime) unless target already matches its
+    size and mtime; re-renders then skip re-copying avatars and images.
+    Raises FileNotFoundError if source is missing.
+    """
+    src = source.stat()
+    try:
+        dst = target.stat()
+        if dst.st_size == src.st_size and dst.st_mtime_ns == src.st_mtime_ns:
+            return
+    except FileNotFoundError:
+        target.parent.mkdir(parents=True, exist_ok=True)
+    # copyfile is a kernel-side copy (sendfile) on Linux; only the mtime is
+    # carried over, skipping copy2's mode, flags and xattr syscalls
+    shutil.copyfile(source, target)
+    os.utime(target, ns=(src.st_atime_ns, src.st_mtime_ns))
 
 
 def _copy_to_public(source: Path, *, book_id: str) -> Path:
     target = GENERATED_ASSETS_DIR / book_id / source.name
-    target.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy(source, target)
+    _sync_file(source, target)
     return target
 
 
@@ -898,9 +966,16 @@ def _relative_public_path(path: Path) -> str:
 
 
 def get_audio_duration(path: Path) -> float:
+    # Our segments are PCM WAV: the header gives the duration without an ffprobe spawn
+    try:
+        with wave.open(str(path), "rb") as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (wave.Error, EOFError):
+        pass
+
     result = subprocess.run(
         [
-            "ffprobe",
+            executable("ffprobe"),
             "-v",
             "error",
             "-show_entries",
@@ -912,6 +987,7 @@ def get_audio_duration(path: Path) -> float:
         capture_output=True,
         text=True,
         check=True,
+        **SPAWN_KWARGS,
     )
     try:
         return float(result.stdout.strip())
@@ -919,37 +995,71 @@ def get_audio_duration(path: Path) -> float:
         return 0.0
 
 
+def _concat_wavs(segment_paths: List[Path], out_path: Path) -> bool:
+    """
+    Join PCM WAV segments in-process by copying their frames; returns False
+    (writing nothing) unless every segment shares one sample format
+    """
+    try:
+        formats = set()
+        for segment in segment_paths:
+            with wave.open(str(segment), "rb") as wav:
+                formats.add((wav.getnchannels(), wav.getsampwidth(), wav.getframerate()))
+    except (wave.Error, EOFError):
+        return False
+    if len(formats) != 1:
+        return False
+
+    nchannels, sampwidth, framerate = formats.pop()
+    with wave.open(str(out_path), "wb") as out:
+        out.setnchannels(nchannels)
+        out.setsampwidth(sampwidth)
+        out.setframerate(framerate)
+        for segment in segment_paths:
+            with wave.open(str(segment), "rb") as wav:
+                while frames := wav.readframes(1 << 16):
+                    out.writeframesraw(frames)
+    return True
+
+
 def concat_audios(segment_paths: List[Path], out_path: Path) -> None:
     if not segment_paths:
         raise ValueError("No audio segments provided for concatenation.")
     if len(segment_paths) == 1:
-        shutil.copy(segment_paths[0], out_path)
+        shutil.copyfile(segment_paths[0], out_path)
         return
 
-    list_file = out_path.with_suffix(".concat.txt")
-    with list_file.open("w", encoding="utf-8") as file:
-        for segment in segment_paths:
-            file.write(f"file '{segment.as_posix()}'\n")
+    # synthesize_tts writes every segment as 44.1kHz stereo PCM, so this
+    # is a plain copy; ffmpeg only handles mismatched or non-WAV input
+    if _concat_wavs(segment_paths, out_path):
+        return
 
+    # The list goes in on stdin; absolute paths, since a piped list has no directory
+    concat_list = "".join(
+        f"file '{segment.resolve().as_posix()}'\n" for segment in segment_paths
+    )
     subprocess.run(
         [
-            "ffmpeg",
+            executable("ffmpeg"),
             "-y",
             "-f",
             "concat",
             "-safe",
             "0",
+            "-protocol_whitelist",
+            "file,pipe",
             "-i",
-            str(list_file),
+            "pipe:0",
             "-c:a",
             "pcm_s16le",
             str(out_path),
         ],
+        input=concat_list.encode("utf-8"),
         check=True,
+        **SPAWN_KWARGS,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
     )
-    list_file.unlink(missing_ok=True)
 
 
 def build_audio_and_timings_for_plan(
@@ -959,15 +1069,26 @@ def build_audio_and_timings_for_plan(
     segments_dir = book_dir / "audio_segments" / plan.lessonId
     segments_dir.mkdir(parents=True, exist_ok=True)
 
-    segment_paths: List[Path] = []
-    timings: List[SlideTiming] = []
-    current_time = 0.0
+    segment_paths = [
+        segments_dir / f"{plan.lessonId}_slide_{idx}.wav" for idx in range(len(plan.slides))
+    ]
+    narrations = [
+        slide.narration.strip() or _default_slide_narration(slide) for slide in plan.slides
+    ]
 
-    for idx, slide in enumerate(plan.slides):
-        narration = slide.narration.strip() or _default_slide_narration(slide)
-        segment_path = segments_dir / f"{plan.lessonId}_slide_{idx}.wav"
+    def synthesize_segment(narration: str, segment_path: Path) -> float:
         synthesize_tts(narration, segment_path)
-        duration = get_audio_duration(segment_path)
+        return get_audio_duration(segment_path)
+
+    # Slides are independent until their timings are laid end to end
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(SLIDE_TTS_CONCURRENCY, len(plan.slides)))
+    ) as pool:
+        durations = list(pool.map(synthesize_segment, narrations, segment_paths))
+
+    timings: List[SlideTiming] = []
+    current_time = 0.0
+    for idx, duration in enumerate(durations):
         timings.append(
             SlideTiming(
                 slideIndex=idx,
@@ -976,7 +1097,6 @@ def build_audio_and_timings_for_plan(
             )
         )
         current_time += duration
-        segment_paths.append(segment_path)
 
     final_audio_path = book_dir / f"{plan.lessonId}_audio.wav"
     concat_audios(segment_paths, final_audio_path)
@@ -988,15 +1108,8 @@ def build_audio_and_timings_for_plan(
     return plan, final_audio_path
 
 
-def generate_lesson_video(book_id: str, lesson_index: int) -> Path:
-    book_dir = DATA_DIR / book_id
-    book_dir.mkdir(parents=True, exist_ok=True)
-
-    plan, lesson_meta = _build_plan(book_id, lesson_index)
-    script_text = _load_script(book_id, plan.lessonId)
-    _apply_narrations(plan.slides, script_text)
-
-    # Match book images to slides
+def _attach_book_images(plan: LessonVideoPlan, book_id: str) -> None:
+    """Match book images to slides and copy them where Remotion can read them"""
     book_images = load_book_images(book_id)
     if book_images:
         print(f"📷 Found {len(book_images)} images, matching to slides...")
@@ -1004,15 +1117,38 @@ def generate_lesson_video(book_id: str, lesson_index: int) -> Path:
         # Copy matched images to Remotion public folder
         _copy_matched_images_to_public(plan.slides, book_id)
 
-    plan, final_audio_path = build_audio_and_timings_for_plan(plan, book_dir)
-    audio_public = _copy_to_public(final_audio_path, book_id=book_id)
-    audio_src = _relative_public_path(audio_public)
 
+def _publish_avatar(book_dir: Path, lesson_index: int, book_id: str) -> Optional[str]:
+    """Public path of the lesson's avatar video, or None if none was recorded"""
     avatar_path = book_dir / f"lesson_{lesson_index}_avatar.mp4"
-    avatar_src = None
-    if avatar_path.exists():
+    try:
         avatar_public = _copy_to_public(avatar_path, book_id=book_id)
-        avatar_src = _relative_public_path(avatar_public)
+    except FileNotFoundError:
+        return None
+    return _relative_public_path(avatar_public)
+
+
+def generate_lesson_video(book_id: str, lesson_index: int) -> Path:
+    book_dir = DATA_DIR / book_id
+    book_dir.mkdir(parents=True, exist_ok=True)
+
+    plan, lesson_meta, script_text = _build_plan(book_id, lesson_index)
+    if script_text is None:
+        script_text = _load_script(book_id, plan.lessonId)
+    _apply_narrations(plan.slides, script_text)
+
+    # Image matching (an LLM call) only sets slide.imagePath and the avatar
+    # copy touches no slide, so both run while the narration is synthesized
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        images_done = pool.submit(_attach_book_images, plan, book_id)
+        avatar_done = pool.submit(_publish_avatar, book_dir, lesson_index, book_id)
+
+        plan, final_audio_path = build_audio_and_timings_for_plan(plan, book_dir)
+        audio_public = _copy_to_public(final_audio_path, book_id=book_id)
+        audio_src = _relative_public_path(audio_public)
+
+        images_done.result()
+        avatar_src = avatar_done.result()
 
     props = {
         "plan": plan.model_dump(),
@@ -1021,13 +1157,13 @@ def generate_lesson_video(book_id: str, lesson_index: int) -> Path:
     }
 
     props_path = book_dir / f"lesson_{lesson_index}_props.json"
-    props_path.write_text(json.dumps(props, indent=2), encoding="utf-8")
+    props_path.write_bytes(orjson.dumps(props, option=orjson.OPT_INDENT_2))
 
     output_path = book_dir / f"lesson_{lesson_index}.mp4"
 
     subprocess.run(
         [
-            "npx",
+            executable("npx"),
             "remotion",
             "render",
             "LessonVideo",
@@ -1035,6 +1171,7 @@ def generate_lesson_video(book_id: str, lesson_index: int) -> Path:
             f"--props={props_path.resolve()}",
         ],
         check=True,
+        **SPAWN_KWARGS,
         cwd=VIDEO_DIR,
     )
 
@@ -0,0 +1,144 @@
+"""
+Persistent cache of image descriptions from the vision model
+Keyed by a 256-bit perceptual hash, so the same figure in any uploaded book
+is only analyzed once. Near-identical (not identical) figures are only
+matched within one upload, via NearDuplicateIndex on a 64-bit hash.
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Kept next to (not inside) data/books so it is never served by /static/books
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "vision_cache.sqlite3"
+
+# 64-bit hashes differing in fewer than this many bits count as the same image
+HAMMING_DISTANCE_LIMIT = 4
+
+# Side of the cross-book cache hash (16 -> 256 bits). At 8x8, mostly-white
+# line diagrams from unrelated books collide too easily to share descriptions.
+CACHE_HASH_SIZE = 16
+
+
+def _dhash(gray: Any, hash_size: int) -> int:
+    from PIL import Image
+
+    pixels = list(gray.resize((hash_size + 1, hash_size), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def image_dhash(image_path: Path, hash_size: int = 8) -> int:
+    """
+    Difference hash of hash_size**2 bits: shrink to (hash_size+1) x hash_size
+    grayscale and record whether each pixel is brighter than its right
+    neighbour. Robust to rescaling and recompression, which is how the same
+    figure differs between books.
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        return _dhash(img.convert("L"), hash_size)
+
+
+def image_dhashes(image_path: Path) -> Tuple[int, int]:
+    """(64-bit near-duplicate hash, CACHE_HASH_SIZE cache key hash), from one decode"""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        gray = img.convert("L")
+        return _dhash(gray, 8), _dhash(gray, CACHE_HASH_SIZE)
+
+
+def hash_distance(a: int, b: int) -> int:
+    """Hamming distance between two perceptual hashes"""
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateIndex:
+    """
+    64-bit hashes bucketed by 16-bit quarter. Two hashes within
+    HAMMING_DISTANCE_LIMIT (at most 3 differing bits) share at least one
+    quarter, so a lookup only compares against its own four buckets.
+    """
+
+    def __init__(self):
+        self._buckets: List[Dict[int, List[Tuple[int, int, Any]]]] = [{} for _ in range(4)]
+        self._count = 0
+
+    @staticmethod
+    def _quarters(phash: int) -> List[int]:
+        return [(phash >> shift) & 0xFFFF for shift in (48, 32, 16, 0)]
+
+    def add(self, phash: int, value: Any) -> None:
+        entry = (self._count, phash, value)
+        self._count += 1
+        for bucket, quarter in zip(self._buckets, self._quarters(phash)):
+            bucket.setdefault(quarter, []).append(entry)
+
+    def find(self, phash: int) -> Optional[Any]:
+        """Value of the closest added hash within HAMMING_DISTANCE_LIMIT (earliest on ties), or None"""
+        best: Optional[Tuple[int, int, Any]] = None
+        for bucket, quarter in zip(self._buckets, self._quarters(phash)):
+            for seq, candidate, value in bucket.get(quarter, ()):
+                distance = hash_distance(candidate, phash)
+                if distance < HAMMING_DISTANCE_LIMIT and (
+                    best is None or (distance, seq) < best[:2]
+                ):
+                    best = (distance, seq, value)
+        return best[2] if best is not None else None
+
+
+class VisionCache:
+    """
+    SQLite-backed description cache with exact-hash lookup
+    Safe to share across threads; entries are loaded into memory on first use
+    """
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._entries: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS image_descriptions ("
+                "dhash TEXT PRIMARY KEY, description TEXT NOT NULL)"
+            )
+            conn.commit()
+            # Hashes are stored as hex: SQLite integers are signed 64-bit
+            for dhash, description in conn.execute(
+                "SELECT dhash, description FROM image_descriptions"
+            ):
+                self._entries[int(dhash, 16)] = description
+            self._conn = conn
+        return self._conn
+
+    def get(self, dhash: int) -> Optional[str]:
+        """Description cached for exactly this CACHE_HASH_SIZE hash, or None"""
+        with self._lock:
+            self._connection()
+            return self._entries.get(dhash)
+
+    def set(self, dhash: int, description: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO image_descriptions (dhash, description) VALUES (?, ?)",
+                (format(dhash, f"0{CACHE_HASH_SIZE * CACHE_HASH_SIZE // 4}x"), description),
+            )
+            conn.commit()
+            self._entries[dhash] = description
+
+
+# Singleton instance
+vision_cache = VisionCache()